@@ -23,15 +23,14 @@ def generate_sp500_list():
         # First table contains the constituents
         sp500_table = tables[0]
         
-        # Extract symbols
-        symbols = sp500_table[['Symbol']].copy()
+        # Extract symbols, cleaned (some may have extra characters)
+        symbols = [symbol for symbol in sp500_table['Symbol'].dropna().astype(str).str.strip() if symbol]
         
-        # Clean symbols (some may have extra characters)
-        symbols['Symbol'] = symbols['Symbol'].str.strip()
-        
-        # Save to CSV
+        # Save to CSV: a header and one plain ticker per line, no quoting needed
         output_path = Path(__file__).parent.parent / 'stock_pool' / 'sp500_full.csv'
-        symbols.to_csv(output_path, index=False)
+        with open(output_path, 'w', newline='') as f:
+            f.write('Symbol\n')
+            f.writelines(f"{symbol}\n" for symbol in symbols)
         
         print(f"✓ Successfully saved {len(symbols)} S&P 500 symbols to {output_path}")
         print(f"\nTo use: python -m src.main --universe stock_pool/sp500_full.csv")
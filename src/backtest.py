@@ -3,7 +3,10 @@ Monthly rotation backtest engine with market regime filtering.
 Modular, testable functions following requirements.
 """
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
@@ -27,12 +30,29 @@ def get_month_ends(price_df: pd.DataFrame) -> List[pd.Timestamp]:
     if price_df.empty:
         return []
     
-    # Group by year-month and get last date of each month
-    month_ends = price_df.groupby([price_df.index.year, price_df.index.month]).apply(
-        lambda x: x.index[-1]
-    ).tolist()
+    # Keep the last date of each year-month (index is sorted by date)
+    periods = price_df.index.to_period('M')
+    is_last = ~periods.duplicated(keep='last')
     
-    return month_ends
+    return list(price_df.index[is_last])
+
+
+def asof_position(index: pd.Index, asof_date: pd.Timestamp) -> int:
+    """
+    Count rows of a sorted DatetimeIndex dated on or before asof_date.
+    
+    Binary search replaces an `index <= asof_date` boolean mask, so the
+    lookup is O(log n) and allocates nothing. Slicing with .iloc[:pos]
+    gives the point-in-time history; pos - 1 is the last row.
+    
+    Args:
+        index: Monotonic increasing DatetimeIndex
+        asof_date: Cutoff date (inclusive)
+        
+    Returns:
+        Integer position (0 if no rows on or before asof_date)
+    """
+    return int(index.searchsorted(asof_date, side='right'))
 
 
 def compute_indicators(prices: pd.Series, asof_date: pd.Timestamp,
@@ -49,7 +69,7 @@ def compute_indicators(prices: pd.Series, asof_date: pd.Timestamp,
         Dict with indicator values
     """
     # Filter data up to asof_date (no look-ahead)
-    prices_pit = prices[prices.index <= asof_date]
+    prices_pit = prices.iloc[:asof_position(prices.index, asof_date)]
     
     if len(prices_pit) < calculator.momentum_12m_days:
         return {}
@@ -80,8 +100,32 @@ def score_universe(indicator_dict: Dict[str, Dict[str, float]],
     return ranked_df
 
 
+def select_portfolio(indicator_df: pd.DataFrame, ranker: StockRanker,
+                     top_n: int) -> List[str]:
+    """
+    Rank one rebalance date's indicator table and pick the top N.
+    
+    Args:
+        indicator_df: Indicators for the date (index = symbols)
+        ranker: StockRanker instance
+        top_n: Number of stocks in portfolio
+        
+    Returns:
+        Selected symbols in rank order (empty if nothing ranks)
+    """
+    if indicator_df.empty:
+        return []
+    
+    ranked_df = ranker.rank_frame(indicator_df)
+    if ranked_df.empty:
+        return []
+    
+    return ranked_df.head(top_n)['symbol'].tolist()
+
+
 def check_regime_filter(spy_prices: pd.Series, asof_date: pd.Timestamp,
-                       ma_period: int = 200) -> bool:
+                       ma_period: int = 200,
+                       prefix_sums: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> bool:
     """
     Check if regime filter triggers cash position.
     
@@ -89,34 +133,153 @@ def check_regime_filter(spy_prices: pd.Series, asof_date: pd.Timestamp,
         spy_prices: SPY adjusted close Series
         asof_date: Date to check
         ma_period: MA period (default 200)
+        prefix_sums: Optional spy_prefix_sums(spy_prices) output; makes the
+            MA an O(1) difference instead of a window average
         
     Returns:
         True if should go to cash (SPY < MA200), False otherwise
     """
-    spy_pit = spy_prices[spy_prices.index <= asof_date]
+    pos = asof_position(spy_prices.index, asof_date)
     
-    if len(spy_pit) < ma_period:
+    if pos < ma_period:
         return False  # Not enough data, stay invested
     
-    current_price = spy_pit.iloc[-1]
-    ma200 = spy_pit.rolling(window=ma_period).mean().iloc[-1]
+    values = spy_prices.to_numpy()
+    current_price = values[pos - 1]
+    
+    # Only the trailing window matters; skip the full rolling Series
+    if prefix_sums is not None:
+        sums, nan_counts = prefix_sums
+        if nan_counts[pos] != nan_counts[pos - ma_period]:
+            ma200 = np.nan  # A gap inside the window, as the window mean gives
+        else:
+            ma200 = (sums[pos] - sums[pos - ma_period]) / ma_period
+    else:
+        ma200 = values[pos - ma_period:pos].mean()
     
     return current_price < ma200
 
 
-def run_backtest(universe_prices: Dict[str, pd.Series],
+def spy_prefix_sums(spy_prices: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cumulative sums and NaN counts of SPY prices, each with a leading zero.
+    
+    The mean of values[a:b] is (sums[b] - sums[a]) / (b - a) when
+    nan_counts[b] == nan_counts[a], so any moving average can be read in
+    O(1) after this single pass. NaNs are summed as zero, so a missing
+    price only affects the windows that contain it.
+    
+    Args:
+        spy_prices: SPY adjusted close Series
+        
+    Returns:
+        Tuple of (sums, nan_counts), arrays of length len(spy_prices) + 1
+    """
+    values = spy_prices.to_numpy(dtype=float)
+    missing = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    nan_counts = np.concatenate(([0], np.cumsum(missing)))
+    return sums, nan_counts
+
+
+def _indicator_frames(prices: pd.DataFrame,
+                      calculator: IndicatorCalculator) -> Dict[str, pd.DataFrame]:
+    """
+    Indicator values as of each row of a price table without interior gaps.
+    
+    Args:
+        prices: DataFrame of adj_close (DatetimeIndex x symbols)
+        calculator: IndicatorCalculator instance
+        
+    Returns:
+        Dict mapping indicator name to a DataFrame shaped like prices
+    """
+    returns = prices.pct_change(fill_method=None)
+    
+    def momentum(lookback_days: int) -> pd.DataFrame:
+        past = prices.shift(lookback_days - 1)
+        return (prices - past) / past.where(past != 0)
+    
+    # Max drawdown of (1 + r).cumprod() against its running peak
+    cumulative = (1 + returns).cumprod()
+    running_max = cumulative.cummax()
+    drawdown = (cumulative - running_max) / running_max
+    
+    return {
+        'momentum_6m': momentum(calculator.momentum_6m_days),
+        'momentum_12m': momentum(calculator.momentum_12m_days),
+        'ma50': prices.rolling(window=calculator.ma_short).mean(),
+        'ma200': prices.rolling(window=calculator.ma_long).mean(),
+        'volatility': returns.expanding(min_periods=20).std() * np.sqrt(252),
+        'max_drawdown': drawdown.cummin().abs(),
+        'current_price': prices,
+    }
+
+
+def compute_indicator_panels(price_panel: pd.DataFrame,
+                             calculator: IndicatorCalculator) -> Dict[str, pd.DataFrame]:
+    """
+    Compute point-in-time indicators for all symbols at once.
+    
+    Each returned DataFrame has the same dates x symbols shape as
+    price_panel. Row d holds the value calculator.calculate_all would
+    return using only data up to d, so a single .loc[d] slice replaces
+    one compute_indicators call per symbol.
+    
+    Args:
+        price_panel: DataFrame of adj_close (DatetimeIndex x symbols)
+        calculator: IndicatorCalculator instance
+        
+    Returns:
+        Dict mapping indicator name to dates x symbols DataFrame, plus a
+        boolean 'valid' entry marking symbols with enough history
+    """
+    panels = _indicator_frames(price_panel, calculator)
+    
+    # calculate_all works on each symbol's dropna() history, so windows and
+    # lookbacks count observed prices only. Leading and trailing NaNs (not
+    # yet listed, delisted, calendar union) already behave that way on the
+    # panel; symbols with gaps inside their history are redone on their
+    # observed rows and spread back onto the calendar
+    observed = price_panel.notna()
+    started = observed.cummax()
+    not_ended = observed.iloc[::-1].cummax().iloc[::-1]
+    gapped = price_panel.columns[(started & not_ended & ~observed).any()]
+    
+    if len(gapped):
+        # Every panel but current_price (price_panel itself) is a new frame
+        panels = {name: panel for name, panel in panels.items()
+                  if name != 'current_price'}
+        for symbol in gapped:
+            compact = _indicator_frames(price_panel[[symbol]].dropna(), calculator)
+            for name, panel in panels.items():
+                panel[symbol] = compact[name][symbol].reindex(price_panel.index)
+        panels['current_price'] = price_panel
+    
+    # Carry each symbol's last observation forward, matching the
+    # "last row on or before asof_date" semantics of compute_indicators
+    panels = {name: panel.ffill() for name, panel in panels.items()}
+    panels['above_ma200'] = (panels['current_price'] > panels['ma200']).astype(int)
+    panels['valid'] = observed.cumsum() >= calculator.momentum_12m_days
+    
+    return panels
+
+
+def run_backtest(price_panel: pd.DataFrame,
                 spy_prices: pd.Series,
                 month_ends: List[pd.Timestamp],
                 calculator: IndicatorCalculator,
                 ranker: StockRanker,
                 top_n: int = 10,
                 regime_filter: bool = True,
-                tx_cost_bps: float = 0.0) -> Tuple[pd.DataFrame, Dict]:
+                tx_cost_bps: float = 0.0,
+                indicator_panels: Optional[Dict[str, pd.DataFrame]] = None,
+                n_jobs: int = 1) -> Tuple[pd.DataFrame, Dict]:
     """
     Run monthly rotation backtest.
     
     Args:
-        universe_prices: Dict mapping symbol to adj_close Series
+        price_panel: DataFrame of adj_close (DatetimeIndex x symbols)
         spy_prices: SPY adj_close Series
         month_ends: List of rebalance dates (month-ends)
         calculator: IndicatorCalculator instance
@@ -124,6 +287,10 @@ def run_backtest(universe_prices: Dict[str, pd.Series],
         top_n: Number of stocks in portfolio
         regime_filter: Enable SPY < MA200 cash filter
         tx_cost_bps: Transaction cost in basis points (default 0)
+        indicator_panels: Precomputed compute_indicator_panels output for
+            price_panel (optional, computed here if None)
+        n_jobs: Worker processes for ranking rebalance periods
+            (1 = serial, -1 = all cores)
         
     Returns:
         Tuple of (results_df, summary_dict)
@@ -132,56 +299,84 @@ def run_backtest(universe_prices: Dict[str, pd.Series],
     logger.info(f"Running backtest: {len(month_ends)} periods, Top {top_n}, "
                f"Regime Filter: {regime_filter}, Tx Cost: {tx_cost_bps} bps")
     
+    # Indicators and prices as of each rebalance date, computed once
+    # over the whole panel instead of per symbol per period
+    indicator_names = ['momentum_6m', 'momentum_12m', 'ma50', 'ma200',
+                       'above_ma200', 'volatility', 'max_drawdown', 'current_price']
+    if indicator_panels is None:
+        indicator_panels = compute_indicator_panels(price_panel, calculator)
+    
+    # Contiguous arrays sharing one date axis and one symbol axis:
+    # indicator_values is (periods, symbols, indicators)
+    symbols = price_panel.columns.to_numpy()
+    symbol_pos = {symbol: j for j, symbol in enumerate(symbols)}
+    indicator_values = np.stack([
+        indicator_panels[name].reindex(month_ends, method='pad').to_numpy(dtype=float)
+        for name in indicator_names
+    ], axis=2)
+    valid_values = indicator_panels['valid'].reindex(
+        month_ends, method='pad', fill_value=False
+    ).to_numpy(dtype=bool)
+    price_values = price_panel.ffill().reindex(month_ends, method='pad').to_numpy(dtype=float)
+    spy_values = spy_prices.to_numpy()
+    
+    # One cumulative-sum pass makes every regime check O(1)
+    spy_sums = spy_prefix_sums(spy_prices)
+    
+    n_periods = len(month_ends) - 1
+    
+    # Check regime filter at each month-end
+    in_cash_flags = [False] * n_periods
+    if regime_filter:
+        for i in range(n_periods):
+            in_cash_flags[i] = bool(check_regime_filter(spy_prices, month_ends[i],
+                                                        prefix_sums=spy_sums))
+    
+    # Indicator table for all stocks using data up to each invested month-end
+    invested_periods = [i for i in range(n_periods) if not in_cash_flags[i]]
+    indicator_tables = []
+    for i in invested_periods:
+        valid = valid_values[i]
+        indicator_df = pd.DataFrame(indicator_values[i, valid],
+                                    index=symbols[valid], columns=indicator_names)
+        indicator_df['above_ma200'] = indicator_df['above_ma200'].astype(int)
+        indicator_tables.append(indicator_df)
+    
+    # Rank and select top N; periods are independent, so they can be
+    # spread across worker processes
+    if n_jobs == 1 or len(indicator_tables) < 2:
+        selections = [select_portfolio(table, ranker, top_n) for table in indicator_tables]
+    else:
+        max_workers = os.cpu_count() if n_jobs < 1 else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            selections = list(pool.map(select_portfolio, indicator_tables,
+                                       repeat(ranker), repeat(top_n), chunksize=8))
+    selected_by_period = dict(zip(invested_periods, selections))
+    
     results = []
     
-    for i in range(len(month_ends) - 1):
+    for i in range(n_periods):
         current_date = month_ends[i]
         next_date = month_ends[i + 1]
+        in_cash = in_cash_flags[i]
         
-        logger.debug(f"Rebalance {i+1}/{len(month_ends)-1}: {current_date.date()}")
-        
-        # Check regime filter at current month-end
-        in_cash = False
-        if regime_filter:
-            in_cash = check_regime_filter(spy_prices, current_date)
+        logger.debug(f"Rebalance {i+1}/{n_periods}: {current_date.date()}")
         
-        # Select portfolio for next month
-        selected_symbols = []
-        n_selected = 0
-        
-        if not in_cash:
-            # Compute indicators for all stocks using data up to current_date
-            indicator_dict = {}
-            for symbol, prices in universe_prices.items():
-                ind = compute_indicators(prices, current_date, calculator)
-                if ind:  # Only include stocks with valid indicators
-                    indicator_dict[symbol] = ind
-            
-            # Rank and select top N
-            if indicator_dict:
-                ranked_df = score_universe(indicator_dict, ranker)
-                if not ranked_df.empty:
-                    top_stocks = ranked_df.head(top_n)
-                    selected_symbols = top_stocks['symbol'].tolist()
-                    n_selected = len(selected_symbols)
+        # Portfolio selected for next month
+        selected_symbols = selected_by_period.get(i, [])
+        n_selected = len(selected_symbols)
         
         # Calculate portfolio return for next month
         portfolio_return = 0.0
         
         if selected_symbols:
-            stock_returns = []
-            for symbol in selected_symbols:
-                if symbol in universe_prices:
-                    prices = universe_prices[symbol]
-                    # Get prices at current_date and next_date
-                    price_current = prices[prices.index <= current_date].iloc[-1]
-                    prices_next = prices[prices.index <= next_date]
-                    if not prices_next.empty:
-                        price_next = prices_next.iloc[-1]
-                        ret = (price_next - price_current) / price_current
-                        stock_returns.append(ret)
+            # Get prices at current_date and next_date
+            cols = [symbol_pos[symbol] for symbol in selected_symbols]
+            price_current = price_values[i, cols]
+            price_next = price_values[i + 1, cols]
+            stock_returns = (price_next - price_current) / price_current
             
-            if stock_returns:
+            if len(stock_returns) > 0:
                 # Equal-weight average
                 portfolio_return = np.mean(stock_returns)
                 
@@ -190,10 +385,10 @@ def run_backtest(universe_prices: Dict[str, pd.Series],
                     portfolio_return -= tx_cost_bps / 10000.0
         
         # SPY return for comparison
-        spy_current = spy_prices[spy_prices.index <= current_date].iloc[-1]
-        spy_next_prices = spy_prices[spy_prices.index <= next_date]
-        if not spy_next_prices.empty:
-            spy_next = spy_next_prices.iloc[-1]
+        spy_current = spy_values[asof_position(spy_prices.index, current_date) - 1]
+        pos_next = asof_position(spy_prices.index, next_date)
+        if pos_next > 0:
+            spy_next = spy_values[pos_next - 1]
             spy_return = (spy_next - spy_current) / spy_current
         else:
             spy_return = 0.0
@@ -204,7 +399,7 @@ def run_backtest(universe_prices: Dict[str, pd.Series],
             'portfolio_return': portfolio_return,
             'spy_return': spy_return,
             'in_cash': 1 if in_cash else 0,
-            'selected_symbols': ','.join(selected_symbols) if selected_symbols else '',
+            'selected_symbols': selected_symbols,
             'n_selected': n_selected
         })
     
@@ -230,12 +425,16 @@ def compute_performance_metrics(results_df: pd.DataFrame) -> Dict:
     if results_df.empty:
         return {}
     
+    # Work on the raw float arrays: one pass per statistic, no Series temporaries
+    returns = results_df['portfolio_return'].to_numpy(dtype=float)
+    spy_returns = results_df['spy_return'].to_numpy(dtype=float)
+    
     # Cumulative returns
-    portfolio_cumulative = (1 + results_df['portfolio_return']).cumprod()
-    spy_cumulative = (1 + results_df['spy_return']).cumprod()
+    portfolio_cumulative = np.cumprod(1.0 + returns)
+    spy_cumulative = np.cumprod(1.0 + spy_returns)
     
-    total_return = portfolio_cumulative.iloc[-1] - 1
-    spy_total_return = spy_cumulative.iloc[-1] - 1
+    total_return = portfolio_cumulative[-1] - 1
+    spy_total_return = spy_cumulative[-1] - 1
     
     # CAGR
     n_months = len(results_df)
@@ -244,28 +443,27 @@ def compute_performance_metrics(results_df: pd.DataFrame) -> Dict:
     spy_cagr = (1 + spy_total_return) ** (1 / years) - 1 if years > 0 else 0
     
     # Volatility (annualized)
-    monthly_vol = results_df['portfolio_return'].std()
+    monthly_vol = returns.std(ddof=1) if n_months > 1 else np.nan
     annualized_vol = monthly_vol * np.sqrt(12)
     
     # Sharpe (assuming risk-free = 0)
-    avg_monthly_return = results_df['portfolio_return'].mean()
+    avg_monthly_return = returns.mean()
     sharpe = (avg_monthly_return * 12) / annualized_vol if annualized_vol > 0 else 0
     
     # Max drawdown
-    cumulative = (1 + results_df['portfolio_return']).cumprod()
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
+    running_max = np.maximum.accumulate(portfolio_cumulative)
+    drawdown = (portfolio_cumulative - running_max) / running_max
     max_drawdown = drawdown.min()
     
     # Win rate
-    win_rate = (results_df['portfolio_return'] > 0).sum() / len(results_df)
+    win_rate = np.count_nonzero(returns > 0) / n_months
     
     # Cash metrics
-    pct_months_in_cash = results_df['in_cash'].mean()
+    pct_months_in_cash = results_df['in_cash'].to_numpy().mean()
     
     # Best/worst months
-    best_month = results_df['portfolio_return'].max()
-    worst_month = results_df['portfolio_return'].min()
+    best_month = returns.max()
+    worst_month = returns.min()
     
     # Start/end dates
     start_date = results_df.index[0]
@@ -293,22 +491,28 @@ def compute_performance_metrics(results_df: pd.DataFrame) -> Dict:
     return summary
 
 
-def plot_equity_curve(results_df: pd.DataFrame, output_path: Path):
+def plot_equity_curve(results_df: pd.DataFrame, output_path: Path, dpi: int = 300):
     """
     Create equity curve chart comparing portfolio vs SPY.
     
     Args:
         results_df: DataFrame with portfolio_return, spy_return
-        output_path: Path to save PNG file
+        output_path: Path to save the chart (format from the suffix)
+        dpi: Resolution for raster formats such as PNG
     """
-    import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
     
     # Calculate cumulative returns (starting from $100)
     portfolio_cumulative = (1 + results_df['portfolio_return']).cumprod() * 100
     spy_cumulative = (1 + results_df['spy_return']).cumprod() * 100
     
-    fig, ax = plt.subplots(figsize=(12, 6))
+    # Drawn straight on an Agg canvas, outside pyplot, so the caller's
+    # backend and open figures are left alone
+    fig = Figure(figsize=(12, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     
     ax.plot(results_df.index, portfolio_cumulative, 
            label='Portfolio (Monthly Rotation)', linewidth=2.5, color='#2E86AB')
@@ -324,11 +528,10 @@ def plot_equity_curve(results_df: pd.DataFrame, output_path: Path):
     # Format x-axis
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
     ax.xaxis.set_major_locator(mdates.YearLocator())
-    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+    ax.tick_params(axis='x', labelrotation=45)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
 
 
 class BacktestRunner:
@@ -351,17 +554,48 @@ class BacktestRunner:
         self.output_dir = output_dir
         self.logger = logging.getLogger(__name__)
         
+        # Last (calculator params, price panel, indicator panels) computed,
+        # reused by parameter sweeps that rerun on the same data
+        self._indicator_cache = None
+        
         # Create backtest subdirectory
         self.backtest_dir = output_dir / 'backtest'
         self.backtest_dir.mkdir(exist_ok=True, parents=True)
     
+    def _get_indicator_panels(self, price_panel: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Compute indicator panels, reusing the previous result when possible.
+        
+        Indicators depend only on the prices and the calculator's lookback
+        settings, so reruns that vary top_n, regime filter or costs skip
+        the recomputation.
+        
+        Args:
+            price_panel: DataFrame of adj_close (DatetimeIndex x symbols)
+            
+        Returns:
+            Dict from compute_indicator_panels
+        """
+        params = self.calculator.params
+        
+        if self._indicator_cache is not None:
+            cached_params, cached_panel, cached_indicators = self._indicator_cache
+            if cached_params == params and cached_panel.equals(price_panel):
+                self.logger.info("Reusing indicator panels from previous run")
+                return cached_indicators
+        
+        indicator_panels = compute_indicator_panels(price_panel, self.calculator)
+        self._indicator_cache = (params, price_panel, indicator_panels)
+        return indicator_panels
+    
     def run(self,
             stock_data: Dict[str, pd.DataFrame],
             benchmark_data: pd.DataFrame,
             top_n: int = 10,
             regime_filter: bool = True,
             tx_cost_bps: float = 0.0,
-            universe_name: str = None) -> Dict:
+            universe_name: str = None,
+            n_jobs: int = 1) -> Dict:
         """
         Run complete backtest and generate outputs.
         
@@ -372,6 +606,8 @@ class BacktestRunner:
             regime_filter: Enable regime filter
             tx_cost_bps: Transaction cost in basis points
             universe_name: Universe name for output files (optional)
+            n_jobs: Worker processes for ranking rebalance periods
+                (1 = serial, -1 = all cores)
             
         Returns:
             Dict with results and file paths
@@ -388,6 +624,9 @@ class BacktestRunner:
             self.logger.error("No valid stocks for backtest")
             return {}
         
+        # Align all symbols into one dates x symbols panel
+        price_panel = pd.concat(universe_prices, axis=1, sort=True)
+        
         spy_prices = benchmark_data['adj_close']
         
         # Get month-end dates
@@ -402,14 +641,16 @@ class BacktestRunner:
         
         # Run backtest
         results_df, summary = run_backtest(
-            universe_prices=universe_prices,
+            price_panel=price_panel,
             spy_prices=spy_prices,
             month_ends=month_ends,
             calculator=self.calculator,
             ranker=self.ranker,
             top_n=top_n,
             regime_filter=regime_filter,
-            tx_cost_bps=tx_cost_bps
+            tx_cost_bps=tx_cost_bps,
+            indicator_panels=self._get_indicator_panels(price_panel),
+            n_jobs=n_jobs
         )
         
         if results_df.empty:
@@ -429,7 +670,9 @@ class BacktestRunner:
         
         # 1. Monthly returns CSV
         returns_file = self.backtest_dir / f'{prefix}backtest_monthly_returns_{timestamp}.csv'
-        results_df.to_csv(returns_file)
+        results_df.assign(
+            selected_symbols=results_df['selected_symbols'].str.join(',')
+        ).to_csv(returns_file)
         self.logger.info(f"Saved monthly returns: {returns_file}")
         
         # 2. Summary JSON
@@ -3,12 +3,29 @@ SQLite-based caching layer for stock data.
 """
 import sqlite3
 import logging
-from datetime import datetime, timedelta
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from itertools import chain, repeat
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Dict, Iterator, Optional, List, Tuple
+import numpy as np
 import pandas as pd
 
 
+# Price columns stored in the stock_prices table, in column order
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'adj_close', 'volume']
+
+# Indicator values stored in the indicators table, in column order
+INDICATOR_COLUMNS = ['momentum_6m', 'momentum_12m', 'ma50', 'ma200', 'above_ma200',
+                     'volatility', 'max_drawdown', 'current_price']
+
+
+def _date_index(days: np.ndarray) -> pd.DatetimeIndex:
+    """Build the cache's 'date' index from a datetime64[D] array."""
+    return pd.DatetimeIndex(days.astype('datetime64[ns]'), name='date')
+
+
 class StockCache:
     """SQLite cache for stock price data."""
     
@@ -21,11 +38,32 @@ class StockCache:
         """
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        
+        # One connection for the cache's lifetime; SQLite keeps its statement
+        # cache and pragmas per connection, so reuse avoids re-paying both
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
         self._init_db()
     
+    @contextmanager
+    def _connection(self):
+        """Yield the shared connection under the lock, committing on success."""
+        with self._lock, self._conn:
+            yield self._conn
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
     def _init_db(self):
         """Create database schema if not exists."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
+            # WAL is persistent: readers no longer block the writer and each
+            # transaction costs one fsync at checkpoint instead of two
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS stock_prices (
                     symbol TEXT NOT NULL,
@@ -38,28 +76,64 @@ class StockCache:
                     volume INTEGER,
                     updated_at TEXT NOT NULL,
                     PRIMARY KEY (symbol, date)
-                )
+                ) WITHOUT ROWID
+            """)
+            # Rows are clustered on (symbol, date), so a symbol's history is
+            # one contiguous range scan and a separate symbol index is redundant
+            conn.execute("DROP INDEX IF EXISTS idx_symbol")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_date ON stock_prices(date)
             """)
+            # Column copy of each symbol's adj_close history, one row per
+            # symbol: dates as int64 day numbers and prices as float64 bytes
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol ON stock_prices(symbol)
+                CREATE TABLE IF NOT EXISTS adj_close_series (
+                    symbol TEXT PRIMARY KEY,
+                    dates BLOB NOT NULL,
+                    adj_close BLOB NOT NULL
+                ) WITHOUT ROWID
             """)
+            # Screening indicators per symbol and lookback settings, valid
+            # for the price history spanning first_date..last_date (n_days)
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_date ON stock_prices(date)
+                CREATE TABLE IF NOT EXISTS indicators (
+                    symbol TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    first_date TEXT NOT NULL,
+                    last_date TEXT NOT NULL,
+                    n_days INTEGER NOT NULL,
+                    momentum_6m REAL,
+                    momentum_12m REAL,
+                    ma50 REAL,
+                    ma200 REAL,
+                    above_ma200 INTEGER,
+                    volatility REAL,
+                    max_drawdown REAL,
+                    current_price REAL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (symbol, params)
+                ) WITHOUT ROWID
             """)
-            conn.commit()
     
-    def get_cached_data(self, symbol: str, start_date: Optional[str] = None) -> Optional[pd.DataFrame]:
+    def get_cached_data(self, symbol: str, start_date: Optional[str] = None,
+                        columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Retrieve cached data for a symbol.
         
         Args:
             symbol: Stock ticker symbol
             start_date: Optional start date filter (YYYY-MM-DD)
+            columns: Optional subset of PRICE_COLUMNS to read (default: all)
             
         Returns:
             DataFrame with cached data or None if not found
         """
-        query = "SELECT date, open, high, low, close, adj_close, volume FROM stock_prices WHERE symbol = ?"
+        columns = columns or PRICE_COLUMNS
+        unknown = set(columns) - set(PRICE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown price columns: {sorted(unknown)}")
+        
+        query = f"SELECT date, {', '.join(columns)} FROM stock_prices WHERE symbol = ?"
         params = [symbol]
         
         if start_date:
@@ -69,14 +143,26 @@ class StockCache:
         query += " ORDER BY date ASC"
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                df = pd.read_sql_query(query, conn, params=params)
+            if columns == ['adj_close']:
+                series = self._get_adj_close_series(symbol, start_date)
+                if series is not None:
+                    return series
+            
+            with self._connection() as conn:
+                rows = conn.execute(query, params).fetchall()
                 
-            if df.empty:
+            if not rows:
                 return None
             
-            df['date'] = pd.to_datetime(df['date'])
-            df.set_index('date', inplace=True)
+            # Build typed columns straight from the row tuples; NULLs become NaN
+            dates, *values = zip(*rows)
+            data = {}
+            for name, column in zip(columns, values):
+                data[name] = np.array(column, dtype=float)
+                if name == 'volume' and not np.isnan(data[name]).any():
+                    data[name] = data[name].astype(np.int64)
+            
+            df = pd.DataFrame(data, index=_date_index(np.array(dates, dtype='datetime64[D]')))
             
             self.logger.debug(f"Retrieved {len(df)} cached rows for {symbol}")
             return df
@@ -85,7 +171,7 @@ class StockCache:
             self.logger.error(f"Error retrieving cached data for {symbol}: {e}")
             return None
     
-    def get_last_date(self, symbol: str) -> Optional[str]:
+    def get_last_date(self, symbol: str) -> Optional[date]:
         """
         Get the most recent date in cache for a symbol.
         
@@ -93,19 +179,46 @@ class StockCache:
             symbol: Stock ticker symbol
             
         Returns:
-            Latest date as string (YYYY-MM-DD) or None
+            Latest cached date or None
         """
         query = "SELECT MAX(date) as last_date FROM stock_prices WHERE symbol = ?"
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 result = conn.execute(query, [symbol]).fetchone()
-                return result[0] if result and result[0] else None
+                return date.fromisoformat(result[0]) if result and result[0] else None
         
         except Exception as e:
             self.logger.error(f"Error getting last date for {symbol}: {e}")
             return None
     
+    def get_last_dates(self, symbols: List[str]) -> Dict[str, date]:
+        """
+        Get the most recent cached date for several symbols at once.
+        
+        Args:
+            symbols: Stock ticker symbols
+            
+        Returns:
+            Dict mapping each cached symbol to its latest cached date
+        """
+        query = "SELECT MAX(date) FROM stock_prices WHERE symbol = ?"
+        
+        try:
+            # One indexed lookup per symbol under a single connection, so the
+            # cost follows the request size rather than the cache size
+            last_dates = {}
+            with self._connection() as conn:
+                for symbol in symbols:
+                    last_date = conn.execute(query, [symbol]).fetchone()[0]
+                    if last_date:
+                        last_dates[symbol] = date.fromisoformat(last_date)
+            return last_dates
+        
+        except Exception as e:
+            self.logger.error(f"Error getting last dates: {e}")
+            return {}
+    
     def save_data(self, symbol: str, df: pd.DataFrame):
         """
         Save or update stock data in cache.
@@ -119,56 +232,241 @@ class StockCache:
             self.logger.warning(f"Empty DataFrame provided for {symbol}, skipping cache")
             return
         
-        # Prepare data for insertion
-        df = df.copy()
-        df.reset_index(inplace=True)
-        
-        # Rename columns to match our schema
-        column_mapping = {
-            'Date': 'date',
-            'Open': 'open',
-            'High': 'high',
-            'Low': 'low',
-            'Close': 'close',
-            'Adj Close': 'adj_close',
-            'Volume': 'volume'
-        }
-        df.rename(columns=column_mapping, inplace=True)
-        
-        # Ensure date is in string format
-        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
-        df['symbol'] = symbol
-        df['updated_at'] = datetime.now().isoformat()
-        
-        # Select only the columns we need
-        columns = ['symbol', 'date', 'open', 'high', 'low', 'close', 'adj_close', 'volume', 'updated_at']
-        df = df[columns]
-        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                df.to_sql('stock_prices', conn, if_exists='append', index=False, method='multi')
-                conn.commit()
-                self.logger.debug(f"Saved {len(df)} rows for {symbol}")
-        
-        except sqlite3.IntegrityError:
-            # Handle duplicate entries by updating
-            self._upsert_data(symbol, df)
+            self._upsert_data({symbol: df})
+            self.logger.debug(f"Upserted {len(df)} rows for {symbol}")
         
         except Exception as e:
             self.logger.error(f"Error saving data for {symbol}: {e}")
             raise
     
-    def _upsert_data(self, symbol: str, df: pd.DataFrame):
-        """Update existing records or insert new ones."""
-        with sqlite3.connect(self.db_path) as conn:
-            for _, row in df.iterrows():
-                conn.execute("""
-                    INSERT OR REPLACE INTO stock_prices 
-                    (symbol, date, open, high, low, close, adj_close, volume, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, tuple(row))
-            conn.commit()
-            self.logger.debug(f"Upserted {len(df)} rows for {symbol}")
+    def save_data_many(self, data: Dict[str, pd.DataFrame]):
+        """
+        Save or update data for several symbols in one transaction.
+        
+        Args:
+            data: Dict mapping symbol to DataFrame in the save_data format
+        """
+        frames = {symbol: df for symbol, df in data.items() if not df.empty}
+        if not frames:
+            return
+        
+        try:
+            self._upsert_data(frames)
+            self.logger.debug(f"Upserted {sum(len(df) for df in frames.values())} rows "
+                              f"for {len(frames)} symbols")
+        
+        except Exception as e:
+            self.logger.error(f"Error saving data for {len(frames)} symbols: {e}")
+            raise
+    
+    @staticmethod
+    def normalize(df: pd.DataFrame, start_date: Optional[str] = None,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Convert a yfinance-style DataFrame to the get_cached_data format.
+        
+        Args:
+            df: DataFrame with columns: Open, High, Low, Close, Adj Close, Volume
+            start_date: Optional start date filter (YYYY-MM-DD)
+            columns: Optional subset of PRICE_COLUMNS to keep (default: all)
+            
+        Returns:
+            DataFrame as get_cached_data would return it after save_data(df)
+        """
+        # Dates are the (local wall-clock) calendar days the cache stores
+        dates = pd.DatetimeIndex(df.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        dates = dates.normalize()
+        
+        source = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+        data = {name: df[col].to_numpy(dtype=float) for name, col in zip(PRICE_COLUMNS, source)}
+        if not np.isnan(data['volume']).any():
+            data['volume'] = data['volume'].astype(np.int64)
+        
+        result = pd.DataFrame(data, index=_date_index(dates.to_numpy().astype('datetime64[D]')))
+        
+        # Later rows win on duplicate dates, like INSERT OR REPLACE
+        result = result[~result.index.duplicated(keep='last')].sort_index()
+        if start_date:
+            result = result[result.index >= start_date]
+        
+        return result[columns or PRICE_COLUMNS]
+    
+    def _price_rows(self, symbol: str, df: pd.DataFrame) -> Iterator[tuple]:
+        """Build stock_prices parameter rows from a yfinance-style DataFrame."""
+        # Rows come straight from the column arrays; dates are formatted
+        # from the (local wall-clock) index in one vectorized cast
+        dates = pd.DatetimeIndex(df.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        date_strs = dates.values.astype('datetime64[D]').astype(str).tolist()
+        
+        columns = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+        return zip(
+            repeat(symbol),
+            date_strs,
+            *(df[col].tolist() for col in columns),
+            repeat(datetime.now().isoformat())
+        )
+    
+    def _upsert_data(self, frames: Dict[str, pd.DataFrame]):
+        """Update existing records or insert new ones in a single transaction."""
+        rows = chain.from_iterable(
+            self._price_rows(symbol, df) for symbol, df in frames.items()
+        )
+        
+        with self._connection() as conn:
+            # Current column copies, and which symbols already have price rows
+            # without one (cached before adj_close_series existed)
+            series = {}
+            legacy = set()
+            for symbol in frames:
+                row = conn.execute(
+                    "SELECT dates, adj_close FROM adj_close_series WHERE symbol = ?", [symbol]
+                ).fetchone()
+                if row is not None:
+                    series[symbol] = (np.frombuffer(row[0], dtype=np.int64),
+                                      np.frombuffer(row[1], dtype=np.float64))
+                elif conn.execute(
+                    "SELECT 1 FROM stock_prices WHERE symbol = ? LIMIT 1", [symbol]
+                ).fetchone() is not None:
+                    legacy.add(symbol)
+            
+            conn.executemany("""
+                INSERT OR REPLACE INTO stock_prices 
+                (symbol, date, open, high, low, close, adj_close, volume, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            
+            # Merge the written rows into each column copy; only legacy
+            # symbols are read back in full, once, to build their first copy
+            for symbol, df in frames.items():
+                if symbol in legacy:
+                    history = conn.execute(
+                        "SELECT date, adj_close FROM stock_prices WHERE symbol = ? ORDER BY date ASC",
+                        [symbol]
+                    ).fetchall()
+                    dates, adj_close = zip(*history)
+                    days = np.array(dates, dtype='datetime64[D]').astype(np.int64)
+                    values = np.array(adj_close, dtype=float)
+                else:
+                    days, values = self._merge_series(series.get(symbol), *self._adj_close_arrays(df))
+                
+                conn.execute(
+                    "INSERT OR REPLACE INTO adj_close_series (symbol, dates, adj_close) VALUES (?, ?, ?)",
+                    [symbol, days.tobytes(), values.tobytes()]
+                )
+    
+    @staticmethod
+    def _adj_close_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Day numbers and adj_close values of a yfinance-style DataFrame, as stored."""
+        dates = pd.DatetimeIndex(df.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        days = dates.values.astype('datetime64[D]').astype(np.int64)
+        values = df['Adj Close'].to_numpy(dtype=float)
+        
+        # Later rows win on duplicate dates, like INSERT OR REPLACE
+        keep = ~pd.Index(days).duplicated(keep='last')
+        return days[keep], values[keep]
+    
+    @staticmethod
+    def _merge_series(existing: Optional[Tuple[np.ndarray, np.ndarray]],
+                      days: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge new (days, values) into an existing column copy; new values win."""
+        if existing is not None:
+            old_days, old_values = existing
+            kept = ~np.isin(old_days, days)
+            days = np.concatenate([old_days[kept], days])
+            values = np.concatenate([old_values[kept], values])
+        
+        order = np.argsort(days, kind='stable')
+        return days[order], values[order]
+    
+    def _get_adj_close_series(self, symbol: str, start_date: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Read a symbol's adj_close history from its column copy, if present."""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT dates, adj_close FROM adj_close_series WHERE symbol = ?", [symbol]
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        dates = np.frombuffer(row[0], dtype=np.int64).astype('datetime64[D]')
+        adj_close = np.frombuffer(row[1], dtype=np.float64)
+        
+        if start_date:
+            first = np.searchsorted(dates, np.datetime64(start_date, 'D'))
+            dates, adj_close = dates[first:], adj_close[first:]
+        
+        if not len(dates):
+            return None
+        
+        return pd.DataFrame({'adj_close': adj_close.copy()}, index=_date_index(dates))
+    
+    def get_indicators(self, params: str) -> pd.DataFrame:
+        """
+        Retrieve cached indicators computed with the given settings.
+        
+        Args:
+            params: Serialized indicator lookback settings
+            
+        Returns:
+            DataFrame indexed by symbol with first_date, last_date, n_days
+            and one column per indicator (empty if nothing is cached)
+        """
+        query = f"SELECT symbol, first_date, last_date, n_days, {', '.join(INDICATOR_COLUMNS)} " \
+                "FROM indicators WHERE params = ?"
+        columns = ['symbol', 'first_date', 'last_date', 'n_days'] + INDICATOR_COLUMNS
+        
+        try:
+            with self._connection() as conn:
+                rows = conn.execute(query, [params]).fetchall()
+            
+            df = pd.DataFrame.from_records(rows, columns=columns).set_index('symbol')
+            # NULLs come back as None; keep indicator columns numeric
+            df[INDICATOR_COLUMNS] = df[INDICATOR_COLUMNS].astype(float)
+            return df
+        
+        except Exception as e:
+            self.logger.error(f"Error retrieving cached indicators: {e}")
+            return pd.DataFrame(columns=columns[1:])
+    
+    def save_indicators(self, params: str, indicators: pd.DataFrame):
+        """
+        Save or replace cached indicators.
+        
+        Args:
+            params: Serialized indicator lookback settings
+            indicators: DataFrame indexed by symbol with first_date,
+                last_date, n_days and one column per indicator
+        """
+        if indicators.empty:
+            return
+        
+        columns = ['first_date', 'last_date', 'n_days'] + INDICATOR_COLUMNS
+        values = indicators[columns].astype(object).where(indicators[columns].notna(), None)
+        rows = zip(
+            indicators.index.tolist(),
+            repeat(params),
+            *(values[col].tolist() for col in columns),
+            repeat(datetime.now().isoformat())
+        )
+        
+        try:
+            with self._connection() as conn:
+                conn.executemany(f"""
+                    INSERT OR REPLACE INTO indicators
+                    (symbol, params, {', '.join(columns)}, updated_at)
+                    VALUES ({', '.join('?' * (len(columns) + 3))})
+                """, rows)
+            self.logger.debug(f"Cached indicators for {len(indicators)} symbols")
+        
+        except Exception as e:
+            self.logger.error(f"Error saving cached indicators: {e}")
     
     def clear_symbol(self, symbol: str):
         """
@@ -178,9 +476,10 @@ class StockCache:
             symbol: Stock ticker symbol
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.execute("DELETE FROM stock_prices WHERE symbol = ?", [symbol])
-                conn.commit()
+                conn.execute("DELETE FROM adj_close_series WHERE symbol = ?", [symbol])
+                conn.execute("DELETE FROM indicators WHERE symbol = ?", [symbol])
                 self.logger.info(f"Cleared cache for {symbol}")
         
         except Exception as e:
@@ -189,9 +488,10 @@ class StockCache:
     def clear_all(self):
         """Delete all cached data."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 conn.execute("DELETE FROM stock_prices")
-                conn.commit()
+                conn.execute("DELETE FROM adj_close_series")
+                conn.execute("DELETE FROM indicators")
                 self.logger.info("Cleared all cache data")
         
         except Exception as e:
@@ -202,7 +502,7 @@ class StockCache:
         query = "SELECT DISTINCT symbol FROM stock_prices ORDER BY symbol"
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 result = conn.execute(query).fetchall()
                 return [row[0] for row in result]
         
@@ -46,9 +46,11 @@ class Config:
     
     def __post_init__(self):
         """Ensure directories exist."""
-        self.cache_dir.mkdir(exist_ok=True, parents=True)
-        self.output_dir.mkdir(exist_ok=True, parents=True)
-        self.stock_pool_dir.mkdir(exist_ok=True, parents=True)
+        # Skip mkdir when the directory is already there (the common case
+        # for every Config() after the first)
+        for directory in (self.cache_dir, self.output_dir, self.stock_pool_dir):
+            if not directory.is_dir():
+                directory.mkdir(exist_ok=True, parents=True)
     
     @property
     def cache_db_path(self) -> Path:
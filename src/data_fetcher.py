@@ -2,8 +2,10 @@
 Data fetching module using yfinance with caching support.
 """
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, List, Dict, Optional
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from tqdm import tqdm
@@ -11,23 +13,32 @@ from tqdm import tqdm
 from .cache import StockCache
 
 
+# Columns every downloaded frame must provide before it is cached
+REQUIRED_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+
 class DataFetcher:
     """Fetch stock data from yfinance with intelligent caching."""
     
-    def __init__(self, cache: StockCache, start_date: str = "2010-01-01"):
+    def __init__(self, cache: StockCache, start_date: str = "2010-01-01",
+                 session: Optional[Any] = None):
         """
         Initialize data fetcher.
         
         Args:
             cache: StockCache instance
             start_date: Default start date for historical data (YYYY-MM-DD)
+            session: Optional HTTP session shared by every yfinance request
+                (default: yfinance's own shared session)
         """
         self.cache = cache
         self.start_date = start_date
+        self.session = session
         self.logger = logging.getLogger(__name__)
     
     def fetch_symbol(self, symbol: str, start_date: Optional[str] = None, 
-                     force_refresh: bool = False) -> Optional[pd.DataFrame]:
+                     force_refresh: bool = False,
+                     columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Fetch data for a single symbol with caching.
         
@@ -35,6 +46,7 @@ class DataFetcher:
             symbol: Stock ticker symbol
             start_date: Start date (YYYY-MM-DD), uses default if None
             force_refresh: If True, bypass cache and re-download
+            columns: Cached columns to return (default: all OHLCV columns)
             
         Returns:
             DataFrame with OHLCV data and adj_close, or None if error
@@ -45,33 +57,38 @@ class DataFetcher:
         if force_refresh:
             self.logger.info(f"Force refresh for {symbol}")
             self.cache.clear_symbol(symbol)
-            return self._download_and_cache(symbol, start)
+            return self._download_and_cache(symbol, start, columns)
         
         # Try to get from cache
         last_cached_date = self.cache.get_last_date(symbol)
         
         if last_cached_date:
-            # Check if cache is recent (within 2 days)
-            last_date = datetime.strptime(last_cached_date, '%Y-%m-%d')
-            days_old = (datetime.now() - last_date).days
-            
-            if days_old <= 2:
-                # Cache is fresh, use it
-                self.logger.debug(f"Using fresh cache for {symbol} (last: {last_cached_date})")
-                return self.cache.get_cached_data(symbol, start)
-            else:
-                # Update cache with recent data
-                self.logger.debug(f"Updating cache for {symbol} from {last_cached_date}")
-                return self._update_cache(symbol, start, last_cached_date)
+            return self._fetch_cached(symbol, start, last_cached_date, date.today(), columns)
         else:
             # No cache, download all
             self.logger.debug(f"No cache for {symbol}, downloading from {start}")
-            return self._download_and_cache(symbol, start)
+            return self._download_and_cache(symbol, start, columns)
+    
+    def _fetch_cached(self, symbol: str, start_date: str, last_cached_date: date, today: date,
+                      columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Return cached data for a symbol, updating the cache first if stale."""
+        # Check if cache is recent (within 2 days)
+        days_old = (today - last_cached_date).days
+        
+        if days_old <= 2:
+            # Cache is fresh, use it
+            self.logger.debug(f"Using fresh cache for {symbol} (last: {last_cached_date})")
+            return self.cache.get_cached_data(symbol, start_date, columns)
+        else:
+            # Update cache with recent data
+            self.logger.debug(f"Updating cache for {symbol} from {last_cached_date}")
+            return self._update_cache(symbol, start_date, last_cached_date, columns)
     
-    def _download_and_cache(self, symbol: str, start_date: str) -> Optional[pd.DataFrame]:
+    def _download_and_cache(self, symbol: str, start_date: str,
+                            columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """Download data from yfinance and cache it."""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=self.session)
             df = ticker.history(start=start_date, auto_adjust=False)
             
             if df.empty:
@@ -79,29 +96,75 @@ class DataFetcher:
                 return None
             
             # Ensure we have required columns
-            required_cols = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
-            if not all(col in df.columns for col in required_cols):
+            if not all(col in df.columns for col in REQUIRED_COLUMNS):
                 self.logger.error(f"Missing required columns for {symbol}")
                 return None
             
             # Cache the data
             self.cache.save_data(symbol, df)
             
-            # Return from cache to ensure consistent format
-            return self.cache.get_cached_data(symbol, start_date)
+            # Return the in-memory copy in the cached format
+            return self.cache.normalize(df, start_date, columns)
         
         except Exception as e:
             self.logger.error(f"Error downloading {symbol}: {e}")
             return None
     
-    def _update_cache(self, symbol: str, start_date: str, last_cached_date: str) -> Optional[pd.DataFrame]:
+    def _download_batch(self, symbols: List[str], start_date: str,
+                        batch_size: int = 20) -> Dict[str, pd.DataFrame]:
+        """
+        Download several symbols with one yfinance request per batch.
+        
+        Args:
+            symbols: Ticker symbols to download
+            start_date: Start date (YYYY-MM-DD)
+            batch_size: Symbols per request
+            
+        Returns:
+            Dict mapping symbol to raw OHLCV DataFrame (symbols with no
+            usable data are omitted)
+        """
+        downloaded = {}
+        
+        for i in range(0, len(symbols), batch_size):
+            batch = symbols[i:i + batch_size]
+            try:
+                data = yf.download(tickers=" ".join(batch), start=start_date,
+                                   auto_adjust=False, group_by='ticker',
+                                   threads=True, progress=False, session=self.session)
+            except Exception as e:
+                self.logger.error(f"Error downloading batch {', '.join(batch)}: {e}")
+                continue
+            
+            if data is None or data.empty:
+                continue
+            
+            # Single-ticker downloads may come back without the ticker level
+            if not isinstance(data.columns, pd.MultiIndex):
+                data = pd.concat({batch[0]: data}, axis=1)
+            
+            tickers = set(data.columns.get_level_values(0))
+            for symbol in batch:
+                if symbol not in tickers:
+                    continue
+                
+                # Batches share one date index; drop dates this symbol lacks
+                df = data[symbol].dropna(how='all')
+                if df.empty or not all(col in df.columns for col in REQUIRED_COLUMNS):
+                    continue
+                
+                downloaded[symbol] = df
+        
+        return downloaded
+    
+    def _update_cache(self, symbol: str, start_date: str, last_cached_date: date,
+                      columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """Update cache with recent data."""
         try:
             # Download from day after last cached date
-            last_date = datetime.strptime(last_cached_date, '%Y-%m-%d')
-            update_start = (last_date + timedelta(days=1)).strftime('%Y-%m-%d')
+            update_start = (last_cached_date + timedelta(days=1)).isoformat()
             
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=self.session)
             df_new = ticker.history(start=update_start, auto_adjust=False)
             
             if not df_new.empty:
@@ -110,44 +173,97 @@ class DataFetcher:
                 self.logger.debug(f"Added {len(df_new)} new rows for {symbol}")
             
             # Return full dataset from cache
-            return self.cache.get_cached_data(symbol, start_date)
+            return self.cache.get_cached_data(symbol, start_date, columns)
         
         except Exception as e:
             self.logger.error(f"Error updating cache for {symbol}: {e}")
             # Fall back to cached data
-            return self.cache.get_cached_data(symbol, start_date)
+            return self.cache.get_cached_data(symbol, start_date, columns)
     
     def fetch_multiple(self, symbols: List[str], start_date: Optional[str] = None,
-                      force_refresh: bool = False, show_progress: bool = True) -> Dict[str, pd.DataFrame]:
+                      force_refresh: bool = False, show_progress: bool = True,
+                      max_workers: Optional[int] = None,
+                      columns: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
         """
         Fetch data for multiple symbols.
         
+        Uncached symbols are batch-downloaded; cached symbols are checked
+        and updated concurrently on a thread pool, since that work is
+        dominated by network round trips which overlap across threads.
+        
         Args:
             symbols: List of ticker symbols
             start_date: Start date (YYYY-MM-DD)
             force_refresh: Force re-download all symbols
             show_progress: Show progress bar
+            max_workers: Concurrent cached-symbol fetches (default: up to 32)
+            columns: Cached columns to return (default: all OHLCV columns)
             
         Returns:
-            Dict mapping symbol to DataFrame
+            Dict mapping symbol to DataFrame, in the order of symbols
         """
         self.logger.info(f"Fetching data for {len(symbols)} symbols")
         
-        results = {}
-        iterator = tqdm(symbols, desc="Fetching data") if show_progress else symbols
+        if not symbols:
+            return {}
+        
+        start = start_date or self.start_date
+        today = date.today()
+        fetched = {}
+        progress = tqdm(total=len(symbols), desc="Fetching data", disable=not show_progress)
         
-        for symbol in iterator:
-            df = self.fetch_symbol(symbol, start_date, force_refresh)
-            if df is not None and not df.empty:
-                results[symbol] = df
-            else:
+        # Symbols with nothing cached (or being refreshed) are downloaded in
+        # batches, one request per batch instead of one per symbol
+        if force_refresh:
+            self.logger.info(f"Force refresh for {len(symbols)} symbols")
+            for symbol in symbols:
+                self.cache.clear_symbol(symbol)
+            last_dates = {}
+        else:
+            last_dates = self.cache.get_last_dates(symbols)
+        cold = [symbol for symbol in symbols if symbol not in last_dates]
+        
+        if cold:
+            self.logger.debug(f"Batch downloading {len(cold)} uncached symbols from {start}")
+            downloaded = self._download_batch(cold, start)
+            if downloaded:
+                self.cache.save_data_many(downloaded)
+            for symbol, df in downloaded.items():
+                fetched[symbol] = self.cache.normalize(df, start, columns)
+            progress.update(len(cold))
+        
+        # Cached symbols only need a freshness check or an incremental update
+        warm = [symbol for symbol in symbols if symbol in last_dates]
+        
+        if warm:
+            workers = max_workers or min(32, len(warm))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._fetch_cached, symbol, start, last_dates[symbol],
+                                    today, columns): symbol
+                    for symbol in warm
+                }
+                for future in as_completed(futures):
+                    fetched[futures[future]] = future.result()
+                    progress.update()
+        
+        progress.close()
+        
+        for symbol in symbols:
+            df = fetched.get(symbol)
+            if df is None or df.empty:
+                fetched.pop(symbol, None)
                 self.logger.warning(f"Skipping {symbol} - no valid data")
         
+        # Keep input order so downstream ranking is deterministic
+        results = {symbol: fetched[symbol] for symbol in symbols if symbol in fetched}
+        
         self.logger.info(f"Successfully fetched {len(results)}/{len(symbols)} symbols")
         return results
     
     def fetch_benchmark(self, benchmark_symbol: str = "SPY", start_date: Optional[str] = None,
-                       force_refresh: bool = False) -> Optional[pd.DataFrame]:
+                       force_refresh: bool = False,
+                       columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Fetch benchmark data (e.g., SPY for S&P 500).
         
@@ -155,12 +271,13 @@ class DataFetcher:
             benchmark_symbol: Benchmark ticker
             start_date: Start date
             force_refresh: Force refresh
+            columns: Cached columns to return (default: all OHLCV columns)
             
         Returns:
             DataFrame with benchmark data
         """
         self.logger.info(f"Fetching benchmark: {benchmark_symbol}")
-        return self.fetch_symbol(benchmark_symbol, start_date, force_refresh)
+        return self.fetch_symbol(benchmark_symbol, start_date, force_refresh, columns)
     
     def validate_data_quality(self, df: pd.DataFrame, min_days: int = 252) -> bool:
         """
@@ -184,3 +301,35 @@ class DataFetcher:
             return False
         
         return True
+    
+    def validate_data_quality_batch(self, stock_data: Dict[str, pd.DataFrame],
+                                    min_days: int = 252) -> List[str]:
+        """
+        Check data quality for many symbols at once.
+        
+        Applies the validate_data_quality rules to every DataFrame with one
+        pass over the concatenated adj_close values.
+        
+        Args:
+            stock_data: Dict mapping symbol to DataFrame
+            min_days: Minimum number of trading days required
+            
+        Returns:
+            Symbols whose data quality is acceptable, in input order
+        """
+        frames = {
+            symbol: df['adj_close'].to_numpy(dtype=float)
+            for symbol, df in stock_data.items() if df is not None and not df.empty
+        }
+        if not frames:
+            return []
+        
+        lengths = np.array([len(values) for values in frames.values()])
+        is_missing = np.isnan(np.concatenate(list(frames.values())))
+        
+        # Missing values per symbol: sum each symbol's slice of the flat array
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        missing = np.add.reduceat(is_missing, offsets)
+        
+        valid = (lengths >= min_days) & (missing <= lengths * 0.1)
+        return [symbol for symbol, ok in zip(frames, valid) if ok]
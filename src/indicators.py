@@ -2,16 +2,18 @@
 Technical indicators calculation module.
 """
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from .cache import StockCache
+
 
 class IndicatorCalculator:
     """Calculate technical indicators for stock screening."""
     
     def __init__(self, momentum_6m_days: int = 126, momentum_12m_days: int = 252,
-                 ma_short: int = 50, ma_long: int = 200):
+                 ma_short: int = 50, ma_long: int = 200, cache: Optional[StockCache] = None):
         """
         Initialize indicator calculator.
         
@@ -20,13 +22,20 @@ class IndicatorCalculator:
             momentum_12m_days: Trading days for 12-month momentum (~252)
             ma_short: Short moving average period
             ma_long: Long moving average period
+            cache: Optional cache for reusing batch indicator results
         """
         self.momentum_6m_days = momentum_6m_days
         self.momentum_12m_days = momentum_12m_days
         self.ma_short = ma_short
         self.ma_long = ma_long
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def params(self) -> Tuple[int, int, int, int]:
+        """Lookback settings that determine every indicator value."""
+        return (self.momentum_6m_days, self.momentum_12m_days, self.ma_short, self.ma_long)
+    
     def calculate_all(self, df: pd.DataFrame) -> Dict[str, float]:
         """
         Calculate all indicators for a stock.
@@ -76,6 +85,136 @@ class IndicatorCalculator:
             self.logger.error(f"Error calculating indicators: {e}")
             return self._empty_indicators()
     
+    def calculate_all_batch(self, stock_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Calculate all indicators for many stocks in one pass.
+        
+        With a cache attached, symbols whose adj_close history (first date,
+        last date and length) matches a cached entry for the current
+        lookback settings are served from the cache; only the rest are
+        computed, and then cached.
+        
+        Args:
+            stock_data: Dict mapping symbol to DataFrame with 'adj_close'
+            
+        Returns:
+            DataFrame indexed by symbol with one column per indicator
+        """
+        if not stock_data:
+            return pd.DataFrame(columns=list(self._empty_indicators()))
+        
+        prices = {
+            symbol: df['adj_close'].dropna() if df is not None and not df.empty
+            else pd.Series(dtype=float)
+            for symbol, df in stock_data.items()
+        }
+        
+        if self.cache is None:
+            return self._calculate_batch(prices)
+        
+        # Indicators are deterministic in the history they were computed on,
+        # so a new trading day (or a refetch) changes the key and misses
+        keys = pd.DataFrame({
+            'first_date': [p.index[0].strftime('%Y-%m-%d') if len(p) else None for p in prices.values()],
+            'last_date': [p.index[-1].strftime('%Y-%m-%d') if len(p) else None for p in prices.values()],
+            'n_days': [len(p) for p in prices.values()]
+        }, index=pd.Index(list(prices), name='symbol'))
+        
+        params = ','.join(map(str, self.params))
+        cached = self.cache.get_indicators(params).reindex(keys.index)
+        hit = (cached[keys.columns] == keys).all(axis=1) & (keys['n_days'] > 0)
+        
+        misses = keys.index[~hit]
+        self.logger.debug(f"Indicator cache: {hit.sum()} hits, {len(misses)} to compute")
+        
+        if len(misses) == 0:
+            result = cached[list(self._empty_indicators())]
+        else:
+            computed = self._calculate_batch({symbol: prices[symbol] for symbol in misses})
+            to_save = keys.loc[misses].join(computed)
+            self.cache.save_indicators(params, to_save[to_save['n_days'] > 0])
+            result = pd.concat([cached.loc[hit, computed.columns], computed]).reindex(keys.index)
+        
+        return result.astype({'above_ma200': int})
+    
+    def _calculate_batch(self, prices: Dict[str, pd.Series]) -> pd.DataFrame:
+        """
+        Calculate all indicators for many price histories at once.
+        
+        Each symbol's non-missing adj_close history is right-aligned into
+        one (days x symbols) array, NaN-padded at the top, so every
+        indicator is a single column-wise NumPy reduction. Values match
+        calculate_all for each symbol.
+        
+        Args:
+            prices: Dict mapping symbol to its adj_close series without NaNs
+            
+        Returns:
+            DataFrame indexed by symbol with one column per indicator
+        """
+        symbols = list(prices)
+        histories = [series.to_numpy(dtype=float) for series in prices.values()]
+        lengths = np.array([len(h) for h in histories])
+        
+        # Right-align histories so row -k is every symbol's k-th latest price
+        n_days = max(lengths.max(), self.momentum_12m_days, self.ma_long)
+        prices = np.full((n_days, len(symbols)), np.nan)
+        
+        # Scatter all histories in one assignment: each value's row is its
+        # distance from the end of its own history
+        ends = np.cumsum(lengths)
+        rows = np.arange(ends[-1]) + np.repeat(n_days - ends, lengths)
+        cols = np.repeat(np.arange(len(symbols)), lengths)
+        prices[rows, cols] = np.concatenate(histories)
+        
+        current = prices[-1]
+        
+        def momentum(lookback_days: int) -> np.ndarray:
+            past = prices[-lookback_days]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(past != 0, (current - past) / past, np.nan)
+        
+        # Simple daily returns; the NaN padding only produces NaN returns
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = prices[1:] / prices[:-1] - 1
+            observed = ~np.isnan(returns)
+            n_returns = observed.sum(axis=0)
+            mean_return = np.where(observed, returns, 0).sum(axis=0) / n_returns
+            squared = np.where(observed, (returns - mean_return) ** 2, 0).sum(axis=0)
+            volatility = np.where(n_returns >= 20, np.sqrt(squared / (n_returns - 1)), np.nan)
+            volatility = volatility * np.sqrt(252)
+            
+            # Cumulative growth is price / first price, so drawdown against
+            # the running peak can be taken on prices directly (from the
+            # first day with a return, as in _calculate_max_drawdown)
+            growth = np.where(observed, prices[1:], np.nan)
+            running_max = np.fmax.accumulate(growth, axis=0)
+            max_drawdown = np.abs(np.fmin.reduce(growth / running_max - 1, axis=0))
+        
+        ma50 = prices[-self.ma_short:].mean(axis=0)
+        ma200 = prices[-self.ma_long:].mean(axis=0)
+        
+        result = pd.DataFrame({
+            'momentum_6m': momentum(self.momentum_6m_days),
+            'momentum_12m': momentum(self.momentum_12m_days),
+            'ma50': ma50,
+            'ma200': ma200,
+            'above_ma200': (current > ma200).astype(int),
+            'volatility': volatility,
+            'max_drawdown': max_drawdown,
+            'current_price': current
+        }, index=pd.Index(symbols, name='symbol'))
+        
+        # Same cut-off as calculate_all: too little history yields NaNs
+        insufficient = lengths < self.momentum_12m_days
+        if insufficient.any():
+            self.logger.warning(f"Insufficient data for {insufficient.sum()} symbols "
+                                f"(< {self.momentum_12m_days} days)")
+            for name, value in self._empty_indicators().items():
+                result.loc[insufficient, name] = value
+        
+        return result
+    
     def _calculate_momentum(self, prices: pd.Series, lookback_days: int) -> float:
         """
         Calculate momentum return over lookback period.
@@ -112,7 +251,8 @@ class IndicatorCalculator:
         if len(prices) < period:
             return np.nan
         
-        return prices.rolling(window=period).mean().iloc[-1]
+        # Only the latest window matters; no need for the full rolling series
+        return float(prices.to_numpy()[-period:].mean())
     
     def _calculate_volatility(self, prices: pd.Series, annual_trading_days: int = 252) -> float:
         """
@@ -125,12 +265,16 @@ class IndicatorCalculator:
         Returns:
             Annualized volatility
         """
-        returns = prices.pct_change().dropna()
+        # Simple returns straight from the price array, no Series copies
+        values = prices.to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = values[1:] / values[:-1] - 1
+        returns = returns[~np.isnan(returns)]
         
         if len(returns) < 20:  # Need minimum data
             return np.nan
         
-        daily_vol = returns.std()
+        daily_vol = float(returns.std(ddof=1))
         annualized_vol = daily_vol * np.sqrt(annual_trading_days)
         
         return annualized_vol
@@ -145,11 +289,17 @@ class IndicatorCalculator:
         Returns:
             Max drawdown as positive decimal (e.g., 0.20 for -20% drawdown)
         """
-        cumulative = (1 + prices.pct_change()).cumprod()
-        running_max = cumulative.expanding().max()
+        values = prices.to_numpy(dtype=float)
+        if len(values) < 2:
+            return np.nan
+        
+        # Compounded returns are price / first price; the peak starts from
+        # the first day that has a return
+        cumulative = values[1:] / values[0]
+        running_max = np.maximum.accumulate(cumulative)
         drawdown = (cumulative - running_max) / running_max
         
-        return abs(drawdown.min())
+        return float(abs(drawdown.min()))
     
     def calculate_relative_strength(self, stock_df: pd.DataFrame, benchmark_df: pd.DataFrame,
                                     lookback_days: int = 126) -> float:
@@ -192,6 +342,65 @@ class IndicatorCalculator:
             self.logger.error(f"Error calculating relative strength: {e}")
             return np.nan
     
+    def calculate_relative_strength_batch(self, stock_data: Dict[str, pd.DataFrame],
+                                          benchmark_df: pd.DataFrame,
+                                          lookback_days: int = 126) -> Dict[str, float]:
+        """
+        Calculate relative strength vs benchmark for many stocks at once.
+        
+        Matches calculate_relative_strength per stock: both momentums are
+        taken over the dates a stock shares with the benchmark. The
+        benchmark is prepared once and all stock dates are matched against
+        it with a single index lookup.
+        
+        Args:
+            stock_data: Dict mapping symbol to stock price DataFrame
+            benchmark_df: Benchmark price DataFrame
+            lookback_days: Lookback period
+            
+        Returns:
+            Dict mapping symbol to relative strength ratio
+        """
+        if not stock_data:
+            return {}
+        
+        try:
+            benchmark_prices = benchmark_df['adj_close'].dropna()
+            stock_prices = [df['adj_close'].dropna() for df in stock_data.values()]
+            
+            # Position of every stock date in the benchmark (-1 if absent),
+            # keeping only the dates each stock shares with the benchmark
+            positions = benchmark_prices.index.get_indexer(
+                pd.DatetimeIndex(np.concatenate([p.index.to_numpy() for p in stock_prices]))
+            )
+            common = positions >= 0
+            values = np.concatenate([p.to_numpy(dtype=float) for p in stock_prices])[common]
+            positions = positions[common]
+            
+            # Per stock, the last common date and the one lookback_days back
+            segments = np.repeat(np.arange(len(stock_prices)), [len(p) for p in stock_prices])[common]
+            n_common = np.bincount(segments, minlength=len(stock_prices))
+            last = np.cumsum(n_common) - 1
+            first = np.maximum(last - (lookback_days - 1), 0)
+            
+            def momentum(prices: np.ndarray) -> np.ndarray:
+                current, past = prices[last], prices[first]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return np.where(past != 0, (current - past) / past, np.nan)
+            
+            benchmark_values = benchmark_prices.to_numpy(dtype=float)
+            if len(values):
+                rs = momentum(values) - momentum(benchmark_values[positions])
+            else:
+                rs = np.full(len(stock_prices), np.nan)
+            rs = np.where(n_common >= lookback_days, rs, np.nan)
+            
+            return dict(zip(stock_data, rs.tolist()))
+        
+        except Exception as e:
+            self.logger.error(f"Error calculating relative strength: {e}")
+            return {symbol: np.nan for symbol in stock_data}
+    
     def _empty_indicators(self) -> Dict[str, float]:
         """Return dict with NaN indicators."""
         return {
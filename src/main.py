@@ -102,6 +102,13 @@ Examples:
         help='Transaction cost in basis points for backtest (default: 0)'
     )
     
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes for backtest ranking, -1 for all cores (default: 1)'
+    )
+    
     return parser.parse_args()
 
 
@@ -184,7 +191,8 @@ def run_backtest(args, logger):
         benchmark_df = fetcher.fetch_benchmark(
             args.benchmark,
             start_date=args.start_date,
-            force_refresh=args.refresh
+            force_refresh=args.refresh,
+            columns=['adj_close']
         )
         
         if benchmark_df is None or benchmark_df.empty:
@@ -198,7 +206,8 @@ def run_backtest(args, logger):
             symbols,
             start_date=args.start_date,
             force_refresh=args.refresh,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            columns=['adj_close']
         )
         
         if not stock_data:
@@ -222,7 +231,8 @@ def run_backtest(args, logger):
             top_n=args.top,
             regime_filter=True,  # Always enabled
             tx_cost_bps=args.tx_cost_bps,
-            universe_name=universe_name
+            universe_name=universe_name,
+            n_jobs=args.jobs
         )
         
         if not results:
@@ -332,7 +342,8 @@ def run_screening(args, logger):
             momentum_6m_days=config.momentum_6m_days,
             momentum_12m_days=config.momentum_12m_days,
             ma_short=config.ma_short,
-            ma_long=config.ma_long
+            ma_long=config.ma_long,
+            cache=cache
         )
         ranker = StockRanker(
             weight_6m=config.weight_6m_momentum,
@@ -353,7 +364,8 @@ def run_screening(args, logger):
         benchmark_df = fetcher.fetch_benchmark(
             args.benchmark,
             start_date=args.start_date,
-            force_refresh=args.refresh
+            force_refresh=args.refresh,
+            columns=['adj_close']
         )
         
         if benchmark_df is None or benchmark_df.empty:
@@ -366,7 +378,8 @@ def run_screening(args, logger):
             symbols,
             start_date=args.start_date,
             force_refresh=args.refresh,
-            show_progress=not args.no_progress
+            show_progress=not args.no_progress,
+            columns=['adj_close']
         )
         
         if not stock_data:
@@ -378,27 +391,27 @@ def run_screening(args, logger):
         
         # Calculate indicators
         logger.info("Calculating indicators...")
-        indicators = {}
         relative_strengths = {}
         
-        for symbol, df in stock_data.items():
-            # Validate data quality
-            if not fetcher.validate_data_quality(df, min_days=config.momentum_12m_days):
+        # Validate data quality
+        valid_symbols = fetcher.validate_data_quality_batch(
+            stock_data, min_days=config.momentum_12m_days
+        )
+        valid_data = {symbol: stock_data[symbol] for symbol in valid_symbols}
+        for symbol in stock_data:
+            if symbol not in valid_data:
                 logger.warning(f"Skipping {symbol} - insufficient data quality")
-                continue
-            
-            # Calculate indicators
-            ind = calculator.calculate_all(df)
-            indicators[symbol] = ind
-            
-            # Calculate relative strength if benchmark available
-            if benchmark_df is not None:
-                rs = calculator.calculate_relative_strength(
-                    df, benchmark_df, lookback_days=config.momentum_6m_days
-                )
-                relative_strengths[symbol] = rs
-        
-        if not indicators:
+        
+        # Calculate relative strength if benchmark available
+        if benchmark_df is not None:
+            relative_strengths = calculator.calculate_relative_strength_batch(
+                valid_data, benchmark_df, lookback_days=config.momentum_6m_days
+            )
+        
+        # Calculate indicators for the whole universe in one pass
+        indicators = calculator.calculate_all_batch(valid_data)
+        
+        if indicators.empty:
             logger.error("No valid indicators calculated")
             print("Error: Could not calculate indicators for any stocks.")
             sys.exit(1)
@@ -407,7 +420,7 @@ def run_screening(args, logger):
         
         # Rank stocks
         logger.info("Ranking stocks...")
-        ranked_df = ranker.rank_stocks(indicators)
+        ranked_df = ranker.rank_frame(indicators)
         
         if ranked_df.empty:
             logger.error("Ranking failed - no valid stocks")
@@ -2,16 +2,42 @@
 Stock ranking system with composite scoring.
 """
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict
 import pandas as pd
 import numpy as np
 
-from .utils import normalize_series
+
+def _descending_order(values: np.ndarray) -> np.ndarray:
+    """Positions that sort values descending, ties in original order, NaN last."""
+    return np.argsort(-values, kind='stable')
+
+
+def _top_n_order(values: np.ndarray, n: int) -> np.ndarray:
+    """First n positions of _descending_order(values), without a full sort."""
+    keys = -values
+    if n >= len(keys):
+        return _descending_order(values)
+    
+    # Partition to find the n-th best key, then sort only the candidates at
+    # or above it (ties included, so the stable tie order is preserved)
+    kth = np.partition(keys, n - 1)[n - 1]
+    if np.isnan(kth):
+        return _descending_order(values)[:n]
+    
+    candidates = np.flatnonzero(keys <= kth)
+    return candidates[np.argsort(keys[candidates], kind='stable')][:n]
 
 
 class StockRanker:
     """Rank stocks based on multi-factor composite score."""
     
+    # Key columns of a portfolio snapshot; equal_weight follows the lead ones
+    _PORTFOLIO_LEAD_COLUMNS = ('symbol', 'rank', 'score')
+    _PORTFOLIO_COLUMNS = _PORTFOLIO_LEAD_COLUMNS + (
+        'momentum_6m', 'momentum_12m', 'above_ma200',
+        'volatility', 'current_price'
+    )
+    
     def __init__(self, weight_6m: float = 0.40, weight_12m: float = 0.30,
                  weight_ma200: float = 0.20, weight_vol: float = 0.10):
         """
@@ -48,10 +74,32 @@ class StockRanker:
             self.logger.warning("No indicators provided for ranking")
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(indicators_dict, orient='index')
-        df.index.name = 'symbol'
-        df.reset_index(inplace=True)
+        # Build the table column by column; pandas infers one dtype per
+        # column instead of per row as from_dict(orient='index') does
+        rows = list(indicators_dict.values())
+        fields = dict.fromkeys(field for row in rows for field in row)
+        indicator_df = pd.DataFrame(
+            {field: [row.get(field, np.nan) for row in rows] for field in fields},
+            index=pd.Index(list(indicators_dict), name='symbol')
+        )
+        
+        return self.rank_frame(indicator_df)
+    
+    def rank_frame(self, indicator_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rank stocks from an indicator table.
+        
+        Args:
+            indicator_df: DataFrame indexed by symbol with indicator columns
+            
+        Returns:
+            DataFrame with rankings and scores
+        """
+        if indicator_df.empty:
+            self.logger.warning("No indicators provided for ranking")
+            return pd.DataFrame()
+        
+        df = indicator_df.rename_axis('symbol').reset_index()
         
         # Filter out stocks with insufficient data
         initial_count = len(df)
@@ -69,10 +117,10 @@ class StockRanker:
         df = self._calculate_composite_score(df)
         
         # Sort by score descending
-        df = df.sort_values('score', ascending=False)
+        df = df.take(_descending_order(df['score'].to_numpy()))
         
         # Add rank
-        df['rank'] = range(1, len(df) + 1)
+        df['rank'] = np.arange(1, len(df) + 1, dtype=np.int32)
         
         return df
     
@@ -86,24 +134,32 @@ class StockRanker:
         Returns:
             DataFrame with added 'score' column
         """
-        # Normalize each factor to 0-1 scale
-        norm_6m = normalize_series(df['momentum_6m'])
-        norm_12m = normalize_series(df['momentum_12m'])
-        norm_ma200 = df['above_ma200']  # Already 0 or 1
-        norm_vol = normalize_series(df['volatility'], invert=True)  # Lower vol is better
+        if len(df) == 1:
+            # A single stock is its own min and max: every factor except
+            # Above MA200 collapses to 0.5
+            df['score'] = (df['above_ma200'] * self.weight_ma200
+                           + 0.5 * (self.weight_6m + self.weight_12m + self.weight_vol))
+            df['norm_6m'] = df['norm_12m'] = df['norm_vol'] = 0.5
+            return df
+        
+        # Min-max normalize the factors as columns of one array, with the
+        # same rules as normalize_series (constant factors score 0.5)
+        raw = df[['momentum_6m', 'momentum_12m', 'above_ma200', 'volatility']].to_numpy(dtype=float)
+        mins = np.nanmin(raw, axis=0)
+        spans = np.nanmax(raw, axis=0) - mins
+        with np.errstate(divide='ignore', invalid='ignore'):
+            norm = np.where(spans != 0, (raw - mins) / spans, 0.5)
+        
+        norm[:, 2] = raw[:, 2]  # Above MA200 is already 0 or 1
+        if spans[3] != 0:
+            norm[:, 3] = 1 - norm[:, 3]  # Lower vol is better
         
         # Calculate weighted composite score
-        df['score'] = (
-            self.weight_6m * norm_6m +
-            self.weight_12m * norm_12m +
-            self.weight_ma200 * norm_ma200 +
-            self.weight_vol * norm_vol
-        )
+        weights = np.array([self.weight_6m, self.weight_12m, self.weight_ma200, self.weight_vol])
+        df['score'] = norm @ weights
         
         # Store normalized components for analysis
-        df['norm_6m'] = norm_6m
-        df['norm_12m'] = norm_12m
-        df['norm_vol'] = norm_vol
+        df[['norm_6m', 'norm_12m', 'norm_vol']] = norm[:, [0, 1, 3]]
         
         return df
     
@@ -116,9 +172,9 @@ class StockRanker:
             n: Number of top stocks to return
             
         Returns:
-            DataFrame with top N stocks
+            DataFrame with top N stocks (treat as read-only)
         """
-        return ranked_df.head(n).copy()
+        return ranked_df.head(n)
     
     def get_momentum_leaders(self, ranked_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
         """
@@ -131,10 +187,9 @@ class StockRanker:
         Returns:
             DataFrame with top momentum stocks
         """
-        df = ranked_df.copy()
-        df = df.sort_values('momentum_6m', ascending=False)
-        df['momentum_rank'] = range(1, len(df) + 1)
-        return df.head(n)
+        df = ranked_df.take(_top_n_order(ranked_df['momentum_6m'].to_numpy(), n))
+        df['momentum_rank'] = np.arange(1, len(df) + 1, dtype=np.int32)
+        return df
     
     def get_trend_filtered(self, ranked_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
         """
@@ -147,15 +202,15 @@ class StockRanker:
         Returns:
             DataFrame with trend-filtered stocks
         """
-        df = ranked_df[ranked_df['above_ma200'] == 1].copy()
+        df = ranked_df.loc[ranked_df['above_ma200'] == 1]
         
         if df.empty:
             self.logger.warning("No stocks above MA200")
             return pd.DataFrame()
         
-        df = df.sort_values('score', ascending=False)
-        df['trend_rank'] = range(1, len(df) + 1)
-        return df.head(n)
+        df = df.take(_top_n_order(df['score'].to_numpy(), n))
+        df['trend_rank'] = np.arange(1, len(df) + 1, dtype=np.int32)
+        return df
     
     def create_portfolio_snapshot(self, top_stocks: pd.DataFrame) -> pd.DataFrame:
         """
@@ -167,25 +222,20 @@ class StockRanker:
         Returns:
             DataFrame with portfolio weights
         """
-        df = top_stocks.copy()
-        n = len(df)
+        n = len(top_stocks)
         
         if n == 0:
             return pd.DataFrame()
         
-        df['equal_weight'] = 1.0 / n
-        
-        # Select key columns for portfolio
-        portfolio_cols = [
-            'symbol', 'rank', 'score', 'equal_weight', 
-            'momentum_6m', 'momentum_12m', 'above_ma200',
-            'volatility', 'current_price'
-        ]
-        
-        # Include only available columns
-        available_cols = [col for col in portfolio_cols if col in df.columns]
+        # Include only available key columns; copy just those, then add the
+        # weight after the identifying columns
+        columns = top_stocks.columns
+        available_cols = [col for col in self._PORTFOLIO_COLUMNS if col in columns]
+        df = top_stocks[available_cols]
+        position = sum(col in columns for col in self._PORTFOLIO_LEAD_COLUMNS)
+        df.insert(position, 'equal_weight', 1.0 / n)
         
-        return df[available_cols]
+        return df
     
     def add_relative_strength(self, df: pd.DataFrame, 
                              rs_dict: Dict[str, float]) -> pd.DataFrame:
@@ -199,9 +249,9 @@ class StockRanker:
         Returns:
             DataFrame with added 'rel_strength' column
         """
-        df = df.copy()
-        df['rel_strength'] = df['symbol'].map(rs_dict)
-        return df
+        # One hash join on the symbol index instead of a dict lookup per row
+        rs_series = pd.Series(rs_dict, dtype=float)
+        return df.assign(rel_strength=rs_series.reindex(df['symbol'].to_numpy()).to_numpy())
     
     def get_summary_stats(self, ranked_df: pd.DataFrame) -> Dict[str, any]:
         """
@@ -216,13 +266,17 @@ class StockRanker:
         if ranked_df.empty:
             return {}
         
+        # One reduction over the three averaged columns
+        means = ranked_df[['momentum_6m', 'momentum_12m', 'volatility']].mean()
+        n = len(ranked_df)
+        
         stats = {
-            'total_stocks': len(ranked_df),
-            'avg_momentum_6m': ranked_df['momentum_6m'].mean(),
-            'avg_momentum_12m': ranked_df['momentum_12m'].mean(),
-            'avg_volatility': ranked_df['volatility'].mean(),
-            'pct_above_ma200': (ranked_df['above_ma200'].sum() / len(ranked_df)) * 100,
-            'top_score': ranked_df['score'].iloc[0] if len(ranked_df) > 0 else np.nan,
+            'total_stocks': n,
+            'avg_momentum_6m': means.iat[0],
+            'avg_momentum_12m': means.iat[1],
+            'avg_volatility': means.iat[2],
+            'pct_above_ma200': (ranked_df['above_ma200'].sum() / n) * 100,
+            'top_score': ranked_df['score'].iat[0],
             'median_score': ranked_df['score'].median()
         }
         
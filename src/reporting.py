@@ -2,15 +2,27 @@
 Reporting module for console output and file generation.
 """
 import logging
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 
 
 class Reporter:
     """Generate reports for stock screening results."""
     
+    # Console formatters for print_table, by column
+    _FORMATTERS = {
+        'momentum_6m': '{:.2%}'.format,
+        'momentum_12m': '{:.2%}'.format,
+        'volatility': '{:.2%}'.format,
+        'score': '{:.3f}'.format,
+        'equal_weight': '{:.2%}'.format,
+        'current_price': '${:.2f}'.format,
+    }
+    
     def __init__(self, output_dir: Path):
         """
         Initialize reporter.
@@ -22,6 +34,11 @@ class Reporter:
         self.output_dir.mkdir(exist_ok=True, parents=True)
         self.logger = logging.getLogger(__name__)
     
+    @staticmethod
+    def _write_lines(buf: List[str]):
+        """Write buffered report lines to stdout in one call."""
+        sys.stdout.write('\n'.join(buf) + '\n')
+    
     def print_table(self, df: pd.DataFrame, title: str, max_rows: Optional[int] = None):
         """
         Print formatted table to console.
@@ -43,26 +60,14 @@ class Reporter:
         display_df = df.head(max_rows) if max_rows else df
         
         # Format percentages
-        format_dict = {}
-        if 'momentum_6m' in display_df.columns:
-            format_dict['momentum_6m'] = '{:.2%}'.format
-        if 'momentum_12m' in display_df.columns:
-            format_dict['momentum_12m'] = '{:.2%}'.format
-        if 'volatility' in display_df.columns:
-            format_dict['volatility'] = '{:.2%}'.format
-        if 'score' in display_df.columns:
-            format_dict['score'] = '{:.3f}'.format
-        if 'equal_weight' in display_df.columns:
-            format_dict['equal_weight'] = '{:.2%}'.format
-        if 'current_price' in display_df.columns:
-            format_dict['current_price'] = '${:.2f}'.format
+        format_dict = {col: fmt for col, fmt in self._FORMATTERS.items()
+                       if col in display_df.columns}
         
         # Format output
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', None)
-        pd.set_option('display.max_colwidth', 20)
-        
-        print(display_df.to_string(index=False, formatters=format_dict))
+        with pd.option_context('display.max_columns', None,
+                               'display.width', None,
+                               'display.max_colwidth', 20):
+            print(display_df.to_string(index=False, formatters=format_dict))
         print()
     
     def print_summary_stats(self, stats: Dict[str, any]):
@@ -75,18 +80,20 @@ class Reporter:
         if not stats:
             return
         
-        print(f"\n{'=' * 80}")
-        print("SUMMARY STATISTICS")
-        print('=' * 80)
-        
-        print(f"Total Stocks Analyzed: {stats.get('total_stocks', 0)}")
-        print(f"Average 6M Momentum: {stats.get('avg_momentum_6m', 0):.2%}")
-        print(f"Average 12M Momentum: {stats.get('avg_momentum_12m', 0):.2%}")
-        print(f"Average Volatility: {stats.get('avg_volatility', 0):.2%}")
-        print(f"% Above MA200: {stats.get('pct_above_ma200', 0):.1f}%")
-        print(f"Top Score: {stats.get('top_score', 0):.3f}")
-        print(f"Median Score: {stats.get('median_score', 0):.3f}")
-        print()
+        buf = []
+        buf.append(f"\n{'=' * 80}")
+        buf.append("SUMMARY STATISTICS")
+        buf.append('=' * 80)
+        
+        buf.append(f"Total Stocks Analyzed: {stats.get('total_stocks', 0)}")
+        buf.append(f"Average 6M Momentum: {stats.get('avg_momentum_6m', 0):.2%}")
+        buf.append(f"Average 12M Momentum: {stats.get('avg_momentum_12m', 0):.2%}")
+        buf.append(f"Average Volatility: {stats.get('avg_volatility', 0):.2%}")
+        buf.append(f"% Above MA200: {stats.get('pct_above_ma200', 0):.1f}%")
+        buf.append(f"Top Score: {stats.get('top_score', 0):.3f}")
+        buf.append(f"Median Score: {stats.get('median_score', 0):.3f}")
+        buf.append("")
+        self._write_lines(buf)
     
     def save_ranking_csv(self, df: pd.DataFrame, date: Optional[datetime] = None, universe_name: str = None) -> Path:
         """
@@ -117,15 +124,9 @@ class Reporter:
         
         # Include only available columns
         available_cols = [col for col in output_cols if col in df.columns]
-        output_df = df[available_cols].copy()
-        
-        # Format for CSV
-        if 'momentum_6m' in output_df.columns:
-            output_df['momentum_6m_pct'] = output_df['momentum_6m'] * 100
-        if 'momentum_12m' in output_df.columns:
-            output_df['momentum_12m_pct'] = output_df['momentum_12m'] * 100
-        if 'volatility' in output_df.columns:
-            output_df['volatility_pct'] = output_df['volatility'] * 100
+        output_df = df[available_cols].assign(**self._pct_columns(
+            df, ['momentum_6m', 'momentum_12m', 'volatility']
+        ))
         
         output_df.to_csv(filepath, index=False, float_format='%.4f')
         self.logger.info(f"Saved ranking to {filepath}")
@@ -152,24 +153,27 @@ class Reporter:
         filename = f"{prefix}top10_portfolio_{date.strftime('%Y-%m-%d')}.csv"
         filepath = self.output_dir / filename
         
-        # Save as-is
-        output_df = df.copy()
-        
-        # Format for CSV
-        if 'momentum_6m' in output_df.columns:
-            output_df['momentum_6m_pct'] = output_df['momentum_6m'] * 100
-        if 'momentum_12m' in output_df.columns:
-            output_df['momentum_12m_pct'] = output_df['momentum_12m'] * 100
-        if 'volatility' in output_df.columns:
-            output_df['volatility_pct'] = output_df['volatility'] * 100
-        if 'equal_weight' in output_df.columns:
-            output_df['equal_weight_pct'] = output_df['equal_weight'] * 100
+        # Save as-is, plus percentage columns
+        output_df = df.assign(**self._pct_columns(
+            df, ['momentum_6m', 'momentum_12m', 'volatility', 'equal_weight']
+        ))
         
         output_df.to_csv(filepath, index=False, float_format='%.4f')
         self.logger.info(f"Saved portfolio to {filepath}")
         
         return filepath
     
+    @staticmethod
+    def _pct_columns(df: pd.DataFrame, columns: List[str]) -> Dict[str, np.ndarray]:
+        """Build '<col>_pct' columns (value * 100) for the columns df has."""
+        pct_cols = [col for col in columns if col in df.columns]
+        if not pct_cols:
+            return {}
+        
+        # Scale all columns as one block: a single multiply and allocation
+        values = df[pct_cols].to_numpy(dtype=float) * 100.0
+        return {f"{col}_pct": values[:, i] for i, col in enumerate(pct_cols)}
+    
     def print_report_header(self, universe_name: str, n_symbols: int, date: Optional[datetime] = None):
         """
         Print report header.
@@ -182,13 +186,15 @@ class Reporter:
         if date is None:
             date = datetime.now()
         
-        print("\n" + "=" * 80)
-        print("STOCK SCREENING REPORT")
-        print("=" * 80)
-        print(f"Generated: {date.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Universe: {universe_name}")
-        print(f"Symbols Analyzed: {n_symbols}")
-        print("=" * 80)
+        buf = []
+        buf.append("\n" + "=" * 80)
+        buf.append("STOCK SCREENING REPORT")
+        buf.append("=" * 80)
+        buf.append(f"Generated: {date.strftime('%Y-%m-%d %H:%M:%S')}")
+        buf.append(f"Universe: {universe_name}")
+        buf.append(f"Symbols Analyzed: {n_symbols}")
+        buf.append("=" * 80)
+        self._write_lines(buf)
     
     def print_overall_top(self, df: pd.DataFrame, n: int = 20):
         """Print overall top N stocks."""
@@ -206,12 +212,12 @@ class Reporter:
         """Print momentum leaders."""
         display_cols = ['momentum_rank', 'symbol', 'momentum_6m', 'momentum_12m', 
                        'score', 'current_price']
-        available_cols = [col for col in display_cols if col in df.columns]
         
         # Rename rank for clarity
-        display_df = df.copy()
-        if 'momentum_rank' not in display_df.columns and 'rank' in display_df.columns:
-            display_df['momentum_rank'] = display_df['rank']
+        display_df = df
+        if 'momentum_rank' not in df.columns and 'rank' in df.columns:
+            display_df = df.assign(momentum_rank=df['rank'])
+        available_cols = [col for col in display_cols if col in display_df.columns]
         
         self.print_table(
             display_df[available_cols].head(n),
@@ -223,12 +229,12 @@ class Reporter:
         """Print trend-filtered stocks."""
         display_cols = ['trend_rank', 'symbol', 'score', 'momentum_6m', 
                        'ma50', 'ma200', 'current_price']
-        available_cols = [col for col in display_cols if col in df.columns]
         
         # Rename rank for clarity
-        display_df = df.copy()
-        if 'trend_rank' not in display_df.columns and 'rank' in display_df.columns:
-            display_df['trend_rank'] = display_df['rank']
+        display_df = df
+        if 'trend_rank' not in df.columns and 'rank' in df.columns:
+            display_df = df.assign(trend_rank=df['rank'])
+        available_cols = [col for col in display_cols if col in display_df.columns]
         
         self.print_table(
             display_df[available_cols].head(n),
@@ -244,13 +250,15 @@ class Reporter:
             ranking_file: Path to ranking CSV
             portfolio_file: Path to portfolio CSV
         """
-        print("=" * 80)
-        print("FILES SAVED")
-        print("=" * 80)
-        print(f"Full Ranking: {ranking_file}")
-        print(f"Portfolio: {portfolio_file}")
-        print("=" * 80)
-        print()
+        buf = []
+        buf.append("=" * 80)
+        buf.append("FILES SAVED")
+        buf.append("=" * 80)
+        buf.append(f"Full Ranking: {ranking_file}")
+        buf.append(f"Portfolio: {portfolio_file}")
+        buf.append("=" * 80)
+        buf.append("")
+        self._write_lines(buf)
     
     def print_backtest_header(self, start_date: datetime, end_date: datetime, 
                              universe_size: int, top_n: int, regime_filter: bool):
@@ -264,16 +272,18 @@ class Reporter:
             top_n: Number of stocks in portfolio
             regime_filter: Whether regime filter is enabled
         """
-        print("\n" + "=" * 80)
-        print("MONTHLY ROTATION BACKTEST")
-        print("=" * 80)
-        print(f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-        print(f"Universe: {universe_size} stocks")
-        print(f"Portfolio Size: Top {top_n} stocks (equal-weight)")
-        print(f"Regime Filter: {'ENABLED (SPY < MA200 → Cash)' if regime_filter else 'DISABLED'}")
-        print(f"Rebalance: Monthly (end of month)")
-        print("=" * 80)
-        print()
+        buf = []
+        buf.append("\n" + "=" * 80)
+        buf.append("MONTHLY ROTATION BACKTEST")
+        buf.append("=" * 80)
+        buf.append(f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        buf.append(f"Universe: {universe_size} stocks")
+        buf.append(f"Portfolio Size: Top {top_n} stocks (equal-weight)")
+        buf.append(f"Regime Filter: {'ENABLED (SPY < MA200 → Cash)' if regime_filter else 'DISABLED'}")
+        buf.append(f"Rebalance: Monthly (end of month)")
+        buf.append("=" * 80)
+        buf.append("")
+        self._write_lines(buf)
     
     def print_backtest_results(self, results: Dict):
         """
@@ -286,38 +296,40 @@ class Reporter:
             print("No backtest results to display")
             return
         
-        print("\n" + "=" * 80)
-        print("BACKTEST PERFORMANCE SUMMARY")
-        print("=" * 80)
-        
-        print(f"\n{'Portfolio Performance':40} {'Value':>15}")
-        print("-" * 80)
-        print(f"{'Initial Capital':40} ${results['initial_capital']:>14,.2f}")
-        print(f"{'Final Value':40} ${results['final_value']:>14,.2f}")
-        print(f"{'Total Return':40} {results['total_return']:>14.2%}")
-        print(f"{'CAGR':40} {results['cagr']:>14.2%}")
-        
-        print(f"\n{'Risk Metrics':40} {'Value':>15}")
-        print("-" * 80)
-        print(f"{'Annualized Volatility':40} {results['volatility']:>14.2%}")
-        print(f"{'Sharpe Ratio':40} {results['sharpe_ratio']:>14.2f}")
-        print(f"{'Maximum Drawdown':40} {results['max_drawdown']:>14.2%}")
-        print(f"{'Win Rate (Monthly)':40} {results['win_rate']:>14.2%}")
-        
-        print(f"\n{'Benchmark Comparison (SPY)':40} {'Value':>15}")
-        print("-" * 80)
-        print(f"{'Benchmark Total Return':40} {results['benchmark_total_return']:>14.2%}")
-        print(f"{'Benchmark CAGR':40} {results['benchmark_cagr']:>14.2%}")
-        print(f"{'Outperformance':40} {results['outperformance']:>14.2%}")
-        
-        print(f"\n{'Trading Activity':40} {'Value':>15}")
-        print("-" * 80)
-        print(f"{'Number of Rebalances':40} {results['n_rebalances']:>15,}")
-        print(f"{'Number of Trades':40} {results['n_trades']:>15,}")
-        print(f"{'Duration (years)':40} {results['years']:>14.1f}")
-        
-        print("=" * 80)
-        print()
+        buf = []
+        buf.append("\n" + "=" * 80)
+        buf.append("BACKTEST PERFORMANCE SUMMARY")
+        buf.append("=" * 80)
+        
+        buf.append(f"\n{'Portfolio Performance':40} {'Value':>15}")
+        buf.append("-" * 80)
+        buf.append(f"{'Initial Capital':40} ${results['initial_capital']:>14,.2f}")
+        buf.append(f"{'Final Value':40} ${results['final_value']:>14,.2f}")
+        buf.append(f"{'Total Return':40} {results['total_return']:>14.2%}")
+        buf.append(f"{'CAGR':40} {results['cagr']:>14.2%}")
+        
+        buf.append(f"\n{'Risk Metrics':40} {'Value':>15}")
+        buf.append("-" * 80)
+        buf.append(f"{'Annualized Volatility':40} {results['volatility']:>14.2%}")
+        buf.append(f"{'Sharpe Ratio':40} {results['sharpe_ratio']:>14.2f}")
+        buf.append(f"{'Maximum Drawdown':40} {results['max_drawdown']:>14.2%}")
+        buf.append(f"{'Win Rate (Monthly)':40} {results['win_rate']:>14.2%}")
+        
+        buf.append(f"\n{'Benchmark Comparison (SPY)':40} {'Value':>15}")
+        buf.append("-" * 80)
+        buf.append(f"{'Benchmark Total Return':40} {results['benchmark_total_return']:>14.2%}")
+        buf.append(f"{'Benchmark CAGR':40} {results['benchmark_cagr']:>14.2%}")
+        buf.append(f"{'Outperformance':40} {results['outperformance']:>14.2%}")
+        
+        buf.append(f"\n{'Trading Activity':40} {'Value':>15}")
+        buf.append("-" * 80)
+        buf.append(f"{'Number of Rebalances':40} {results['n_rebalances']:>15,}")
+        buf.append(f"{'Number of Trades':40} {results['n_trades']:>15,}")
+        buf.append(f"{'Duration (years)':40} {results['years']:>14.1f}")
+        
+        buf.append("=" * 80)
+        buf.append("")
+        self._write_lines(buf)
     
     def save_backtest_results(self, results: Dict, date: Optional[datetime] = None) -> Path:
         """
@@ -401,8 +413,7 @@ class Reporter:
                       'benchmark_price', 'portfolio_return', 'benchmark_return']
         available_cols = [col for col in output_cols if col in history_df.columns]
         
-        output_df = history_df[available_cols].copy()
-        output_df.to_csv(filepath, float_format='%.4f')
+        history_df[available_cols].to_csv(filepath, float_format='%.4f')
         
         self.logger.info(f"Saved backtest history to {filepath}")
         return filepath
@@ -441,13 +452,15 @@ class Reporter:
             trades_file: Path to trades CSV
             charts_file: Optional path to charts image
         """
-        print("=" * 80)
-        print("BACKTEST FILES SAVED")
-        print("=" * 80)
-        print(f"Summary: {summary_file}")
-        print(f"History: {history_file}")
-        print(f"Trades: {trades_file}")
+        buf = []
+        buf.append("=" * 80)
+        buf.append("BACKTEST FILES SAVED")
+        buf.append("=" * 80)
+        buf.append(f"Summary: {summary_file}")
+        buf.append(f"History: {history_file}")
+        buf.append(f"Trades: {trades_file}")
         if charts_file:
-            print(f"Charts: {charts_file}")
-        print("=" * 80)
-        print()
+            buf.append(f"Charts: {charts_file}")
+        buf.append("=" * 80)
+        buf.append("")
+        self._write_lines(buf)
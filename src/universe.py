@@ -7,8 +7,10 @@ Provides clean abstraction for loading different stock universes:
 - combined: Union of SP500 and MidCap (no duplicates)
 """
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -55,8 +57,7 @@ def load_universe(name: str, base_path: Path = None) -> List[str]:
         midcap_tickers = _load_universe_file('midcap', base_path)
         
         # Merge and deduplicate
-        combined_tickers = list(set(sp500_tickers + midcap_tickers))
-        combined_tickers.sort()
+        combined_tickers = sorted(set(sp500_tickers).union(midcap_tickers))
         
         logger.info(
             f"Loaded combined universe: {len(sp500_tickers)} SP500 + "
@@ -94,37 +95,57 @@ def _load_universe_file(name: str, base_path: Path) -> List[str]:
             f"Expected path: {relative_path}"
         )
     
-    # Read CSV file
-    tickers = []
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Parse tickers (skip header)
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        # Skip empty lines
-        if not line:
-            continue
-        
-        # Skip header row (contains "Symbol" or "symbol")
-        if i == 0 and line.lower() in ['symbol', 'ticker']:
-            continue
-        if i == 0 and ',' in line and 'symbol' in line.lower():
-            continue
-        
-        # Extract ticker (first column if CSV)
-        ticker = line.split(',')[0].strip().upper()
-        
-        # Validate ticker format
-        if ticker and ticker not in ['SYMBOL', 'TICKER']:
-            tickers.append(ticker)
+    stat = file_path.stat()
+    tickers = list(_read_universe_file(file_path, stat.st_mtime_ns, stat.st_size))
     
     logger.info(f"Loaded {len(tickers)} tickers from {name} universe")
     
     return tickers
 
 
+@lru_cache(maxsize=16)
+def _read_universe_file(file_path: Path, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Parse tickers from a universe CSV file.
+    
+    Memoized per path, modification time and size, so repeated runs in
+    one process (e.g. backtest sweeps) parse each file once while edits
+    to the file are still picked up.
+    
+    Args:
+        file_path: Path to the CSV file
+        mtime_ns: File modification time, part of the cache key
+        size: File size in bytes, part of the cache key
+    
+    Returns:
+        Tuple of ticker symbols (uppercase)
+    """
+    # Read the first column of the CSV file; no NA parsing, since tickers
+    # such as NA, NAN or NULL are real symbols
+    try:
+        first_column = pd.read_csv(file_path, header=None, usecols=[0], dtype=str,
+                                   keep_default_na=False,
+                                   skip_blank_lines=True).iloc[:, 0]
+    except pd.errors.EmptyDataError:
+        return ()
+    
+    # Skip header row (e.g. "Symbol", "Ticker" or "Symbol,Name")
+    if len(first_column) and _is_header(first_column.iloc[0]):
+        first_column = first_column.iloc[1:]
+    
+    # Normalize tickers and drop blanks and stray header values
+    tickers = first_column.dropna().str.strip().str.upper()
+    tickers = tickers[(tickers != '') & ~tickers.isin(['SYMBOL', 'TICKER'])].tolist()
+    
+    return tuple(tickers)
+
+
+def _is_header(value: str) -> bool:
+    """Check whether a first-column value is a header label."""
+    label = str(value).strip().lower()
+    return label == 'ticker' or 'symbol' in label
+
+
 def get_universe_display_name(name: str) -> str:
     """
     Get human-readable display name for universe.
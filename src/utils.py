@@ -2,7 +2,9 @@
 Utility functions for stock screening tool.
 """
 import logging
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -30,11 +32,9 @@ def load_stock_universe(csv_path: Path) -> List[str]:
     logger = logging.getLogger(__name__)
     
     try:
-        df = pd.read_csv(csv_path)
-        if 'Symbol' not in df.columns:
-            raise ValueError("CSV must contain 'Symbol' column")
-        
-        symbols = df['Symbol'].dropna().str.strip().tolist()
+        path = Path(csv_path).resolve()
+        stat = path.stat()
+        symbols = list(_read_symbols(path, stat.st_mtime_ns, stat.st_size))
         logger.info(f"Loaded {len(symbols)} symbols from {csv_path}")
         return symbols
     
@@ -43,6 +43,30 @@ def load_stock_universe(csv_path: Path) -> List[str]:
         raise
 
 
+@lru_cache(maxsize=16)
+def _read_symbols(csv_path: Path, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Parse the 'Symbol' column of a universe CSV.
+    
+    Memoized per resolved path, modification time and size, so an edited
+    file is re-read while repeated loads of an unchanged one are free.
+    
+    Args:
+        csv_path: Resolved path to the CSV file
+        mtime_ns: File modification time, part of the cache key
+        size: File size in bytes, part of the cache key
+        
+    Returns:
+        Tuple of ticker symbols
+    """
+    # Tokenize every row but only materialize the Symbol column
+    df = pd.read_csv(csv_path, usecols=lambda col: col == 'Symbol', dtype=str)
+    if 'Symbol' not in df.columns:
+        raise ValueError("CSV must contain 'Symbol' column")
+    
+    return tuple(df['Symbol'].dropna().str.strip())
+
+
 def normalize_series(series: pd.Series, invert: bool = False) -> pd.Series:
     """
     Normalize series to 0-1 range using min-max scaling.
@@ -54,18 +78,27 @@ def normalize_series(series: pd.Series, invert: bool = False) -> pd.Series:
     Returns:
         Normalized series
     """
-    min_val = series.min()
-    max_val = series.max()
+    # Work on the raw array: NaN-skipping min/max like Series.min/max, and
+    # in-place arithmetic into a single output buffer. fmin/fmax reduce
+    # without nanmin's all-NaN check pass; all-NaN input yields NaN bounds
+    # and so an all-NaN result
+    values = series.to_numpy(dtype=float)
+    if values.size == 0:
+        return pd.Series(np.nan, index=series.index)
+    
+    min_val = np.fmin.reduce(values)
+    max_val = np.fmax.reduce(values)
     
     if max_val == min_val:
         return pd.Series(0.5, index=series.index)
     
-    normalized = (series - min_val) / (max_val - min_val)
+    normalized = np.subtract(values, min_val)
+    normalized /= max_val - min_val
     
     if invert:
-        normalized = 1 - normalized
+        np.subtract(1.0, normalized, out=normalized)
     
-    return normalized
+    return pd.Series(normalized, index=series.index, name=series.name, copy=False)
 
 
 def safe_divide(numerator: pd.Series, denominator: pd.Series, fill_value: float = 0.0) -> pd.Series:
@@ -80,7 +113,11 @@ def safe_divide(numerator: pd.Series, denominator: pd.Series, fill_value: float
     Returns:
         Result series
     """
-    result = numerator / denominator
-    result = result.replace([float('inf'), float('-inf')], fill_value)
-    result = result.fillna(fill_value)
-    return result
+    if not numerator.index.equals(denominator.index):
+        numerator, denominator = numerator.align(denominator)
+    
+    # One pass: anything non-finite (x/0, 0/0, NaN inputs) becomes fill_value
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = numerator.to_numpy(dtype=float) / denominator.to_numpy(dtype=float)
+    result = np.where(np.isfinite(result), result, fill_value)
+    return pd.Series(result, index=numerator.index, copy=False)
@@ -6,8 +6,10 @@ from pathlib import Path
 from typing import Dict, Optional
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from datetime import datetime
 
 
@@ -26,12 +28,13 @@ class BacktestVisualizer:
         self.logger = logging.getLogger(__name__)
         
         # Set style
-        plt.style.use('seaborn-v0_8-darkgrid' if 'seaborn-v0_8-darkgrid' in plt.style.available else 'default')
+        matplotlib.style.use('seaborn-v0_8-darkgrid' if 'seaborn-v0_8-darkgrid' in matplotlib.style.available else 'default')
     
     def create_performance_chart(self, 
                                 history_df: pd.DataFrame,
                                 results: Dict,
-                                date: Optional[datetime] = None) -> Path:
+                                date: Optional[datetime] = None,
+                                dpi: int = 150) -> Path:
         """
         Create comprehensive performance chart.
         
@@ -39,6 +42,7 @@ class BacktestVisualizer:
             history_df: DataFrame with portfolio history
             results: Dict with backtest results
             date: Date for filename (default: today)
+            dpi: PNG resolution
             
         Returns:
             Path to saved chart
@@ -49,17 +53,22 @@ class BacktestVisualizer:
         filename = f"backtest_chart_{date.strftime('%Y-%m-%d')}.png"
         filepath = self.output_dir / filename
         
-        # Create figure with subplots
-        fig = plt.figure(figsize=(14, 10))
+        # Growth of $1, shared by the returns and drawdown panels
+        portfolio_cumulative = (1 + history_df['portfolio_return']).cumprod()
+        
+        # Create figure with subplots; drawn straight on an Agg canvas,
+        # outside pyplot's global figure manager
+        fig = Figure(figsize=(14, 10))
+        FigureCanvasAgg(fig)
         gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
         
         # 1. Cumulative Returns (main chart)
         ax1 = fig.add_subplot(gs[0, :])
-        self._plot_cumulative_returns(ax1, history_df, results)
+        self._plot_cumulative_returns(ax1, history_df, results, portfolio_cumulative)
         
         # 2. Drawdown
         ax2 = fig.add_subplot(gs[1, 0])
-        self._plot_drawdown(ax2, history_df)
+        self._plot_drawdown(ax2, history_df, portfolio_cumulative)
         
         # 3. Monthly Returns Distribution
         ax3 = fig.add_subplot(gs[1, 1])
@@ -77,16 +86,16 @@ class BacktestVisualizer:
         fig.suptitle(f'Backtest Performance Report\n{results["start_date"].strftime("%Y-%m-%d")} to {results["end_date"].strftime("%Y-%m-%d")}',
                     fontsize=14, fontweight='bold')
         
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
         
         self.logger.info(f"Saved performance chart to {filepath}")
         return filepath
     
-    def _plot_cumulative_returns(self, ax, history_df: pd.DataFrame, results: Dict):
+    def _plot_cumulative_returns(self, ax, history_df: pd.DataFrame, results: Dict,
+                                 portfolio_cumulative: pd.Series):
         """Plot cumulative returns vs benchmark."""
         # Calculate cumulative returns
-        portfolio_cumulative = (1 + history_df['portfolio_return']).cumprod() * 100
+        portfolio_cumulative = portfolio_cumulative * 100
         benchmark_cumulative = (1 + history_df['benchmark_return']).cumprod() * 100
         
         ax.plot(history_df.index, portfolio_cumulative, 
@@ -102,7 +111,7 @@ class BacktestVisualizer:
         # Format x-axis
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
         ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Add performance text
         text = f'Total Return: {results["total_return"]:.1%}\n'
@@ -112,11 +121,12 @@ class BacktestVisualizer:
                verticalalignment='top', fontsize=9,
                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
-    def _plot_drawdown(self, ax, history_df: pd.DataFrame):
+    def _plot_drawdown(self, ax, history_df: pd.DataFrame, cumulative: pd.Series):
         """Plot drawdown over time."""
-        cumulative = (1 + history_df['portfolio_return']).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
+        # Running peak in one ufunc pass; fmax skips NaN like expanding().max()
+        values = cumulative.to_numpy()
+        running_max = np.fmax.accumulate(values)
+        drawdown = pd.Series((values - running_max) / running_max, index=cumulative.index)
         
         ax.fill_between(history_df.index, drawdown * 100, 0, 
                        color='#E63946', alpha=0.6)
@@ -127,7 +137,7 @@ class BacktestVisualizer:
         # Format x-axis
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
         ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Add max drawdown text
         max_dd = drawdown.min() * 100
@@ -137,7 +147,10 @@ class BacktestVisualizer:
     
     def _plot_monthly_returns_dist(self, ax, history_df: pd.DataFrame):
         """Plot monthly returns distribution."""
-        monthly_returns = history_df['portfolio_return'].resample('M').apply(lambda x: (1 + x).prod() - 1)
+        # Compound daily returns per calendar month as a log-return sum,
+        # aggregated in C rather than through a per-month Python callback
+        log_returns = np.log1p(history_df['portfolio_return'])
+        monthly_returns = np.expm1(log_returns.groupby(history_df.index.to_period('M')).sum())
         
         # Histogram
         ax.hist(monthly_returns * 100, bins=30, color='#06A77D', 
@@ -171,7 +184,7 @@ class BacktestVisualizer:
         # Format x-axis
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
         ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Add average volatility
         avg_vol = rolling_vol.mean()
@@ -183,7 +196,7 @@ class BacktestVisualizer:
     def _plot_cash_allocation(self, ax, history_df: pd.DataFrame):
         """Plot cash vs invested allocation over time."""
         cash_pct = history_df['cash'] / history_df['portfolio_value'] * 100
-        invested_pct = (history_df['portfolio_value'] - history_df['cash']) / history_df['portfolio_value'] * 100
+        invested_pct = 100 - cash_pct
         
         ax.fill_between(history_df.index, 0, invested_pct, 
                        label='Invested', color='#2E86AB', alpha=0.6)
@@ -199,7 +212,7 @@ class BacktestVisualizer:
         # Format x-axis
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
         ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
         # Add cash time percentage
         cash_time_pct = (cash_pct > 50).sum() / len(cash_pct) * 100
@@ -209,13 +222,15 @@ class BacktestVisualizer:
                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
     def create_simple_chart(self, history_df: pd.DataFrame, 
-                          date: Optional[datetime] = None) -> Path:
+                          date: Optional[datetime] = None,
+                          dpi: int = 150) -> Path:
         """
         Create simple cumulative returns chart.
         
         Args:
             history_df: DataFrame with portfolio history
             date: Date for filename (default: today)
+            dpi: PNG resolution
             
         Returns:
             Path to saved chart
@@ -226,7 +241,9 @@ class BacktestVisualizer:
         filename = f"backtest_simple_{date.strftime('%Y-%m-%d')}.png"
         filepath = self.output_dir / filename
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig = Figure(figsize=(12, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
         
         # Calculate cumulative returns
         portfolio_cumulative = (1 + history_df['portfolio_return']).cumprod() * 100
@@ -246,11 +263,10 @@ class BacktestVisualizer:
         # Format x-axis
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
         ax.xaxis.set_major_locator(mdates.YearLocator())
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
         
-        plt.tight_layout()
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
         
         self.logger.info(f"Saved simple chart to {filepath}")
         return filepath
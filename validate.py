@@ -3,6 +3,7 @@ Quick validation script to verify installation and basic functionality.
 
 Run this after setup to ensure everything is working correctly.
 """
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -26,11 +27,11 @@ def validate_installation():
     print("\n2. Checking dependencies...")
     required_packages = ['pandas', 'numpy', 'yfinance', 'matplotlib', 'tqdm']
     
+    # Presence check only; importing is left to the module checks below
     for package in required_packages:
-        try:
-            __import__(package)
+        if importlib.util.find_spec(package) is not None:
             print(f"   ✓ {package}")
-        except ImportError:
+        else:
             errors.append(f"Missing package: {package}")
             print(f"   ✗ {package} - NOT FOUND")
     